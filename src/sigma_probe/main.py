@@ -8,8 +8,9 @@ SIGMA-PROBE Main Module
 import yaml
 import logging
 import sys
+from functools import cached_property
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 from multiprocessing import Pool, cpu_count
 
@@ -39,6 +40,9 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# LibYAML-backed loader when PyYAML was built with it (several times faster)
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 def enrich_event_worker(event: LogEvent) -> LogEvent:
     """Worker function for parallel enrichment"""
     event.calculate_features()
@@ -47,8 +51,10 @@ def enrich_event_worker(event: LogEvent) -> LogEvent:
 class HeliosPipeline:
     """Enhanced pipeline with context sharing, evidence trail, and parallel processing"""
     
-    def __init__(self, config_path: str = "config.yaml"):
-        self.config = self._load_config(config_path)
+    def __init__(self, config: Union[str, Path, Dict[str, Any]] = "config.yaml"):
+        # A ready configuration dict is used as is; anything else is a path
+        # to the YAML config
+        self.config = config if isinstance(config, dict) else self._load_config(config)
         self.context = {}  # Shared context between stages
         self.evidence_summary = []
         
@@ -59,7 +65,7 @@ class HeliosPipeline:
         """Load configuration from YAML file"""
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
             logger.info(f"Configuration loaded from {config_path}")
             return config
         except Exception as e:
@@ -96,8 +102,14 @@ class HeliosPipeline:
                 self.detectors.append(detector)
                 logger.info(f"Initialized detector: {detector_name}")
         
-        # Scoring engine
-        scoring_config = self.config.get('scoring_engine', {})
+        # Scoring engine. Worker count follows the global settings unless
+        # the scoring section sets its own n_jobs
+        scoring_config = dict(self.config.get('scoring_engine', {}))
+        global_config = self.config.get('global', {})
+        if not global_config.get('enable_parallel', True):
+            scoring_config['n_jobs'] = 1
+        elif 'max_workers' in global_config:
+            scoring_config.setdefault('n_jobs', global_config['max_workers'])
         self.scoring_engine = ScoringEngine(scoring_config)
         
         # Narrative engine
@@ -109,6 +121,17 @@ class HeliosPipeline:
         # Reporting stage
         self.reporting = ReportingStage(self.config.get('reporting', {}))
     
+    @cached_property
+    def ioc_manager(self) -> Optional[IoCManager]:
+        """IoC manager for the configured feeds, created on first access.
+
+        One manager lives as long as the pipeline, so repeated runs within
+        the feeds' update_interval do not download them again.
+        """
+        if 'ioc_feeds' not in self.config:
+            return None
+        return IoCManager(self.config['ioc_feeds'])
+    
     def run(self) -> Dict[str, Any]:
         """Run the complete pipeline with context sharing and parallel processing"""
         logger.info("Starting SIGMA-PROBE Helios pipeline")
@@ -127,8 +150,7 @@ class HeliosPipeline:
             
             # Stage 2.5: IoC Integration
             logger.info("=== Stage 2.5: IoC Integration ===")
-            if 'ioc_feeds' in self.config:
-                self.ioc_manager = IoCManager(self.config['ioc_feeds'])
+            if self.ioc_manager is not None:
                 self.ioc_manager.update_feeds()
                 logger.info("IoC feeds updated")
             
@@ -136,7 +158,8 @@ class HeliosPipeline:
             logger.info("=== Stage 3: Profiling ===")
             profiling_context = {'events': enriched_events}
             profiling_result = self.profiling.process(profiling_context)
-            actors = list(profiling_result.get('actors', {}).values())
+            actors_by_ip = profiling_result.get('actors', {})
+            actors = list(actors_by_ip.values())
             logger.info(f"Created {len(actors)} actor profiles")
             
             # Stage 4: Detection with Context Sharing
@@ -157,6 +180,10 @@ class HeliosPipeline:
             campaigns = self.scoring_engine.cluster_campaigns(scored_actors, self.context)
             logger.info(f"Created {len(campaigns)} campaigns")
             
+            # No stage adds tags after clustering; make sure every actor holds a set
+            for actor in scored_actors:
+                actor.finalize()
+            
             # Stage 7: Recommendations & MITRE Mapping
             logger.info("=== Stage 7: Recommendations & MITRE Mapping ===")
             recommendations = self.narrative_engine.generate_recommendations(scored_actors, campaigns)
@@ -188,6 +215,8 @@ class HeliosPipeline:
             
             return {
                 'actors': scored_actors,
+                # The same profiles keyed by IP, as grouped by profiling
+                'actors_by_ip': actors_by_ip,
                 'campaigns': campaigns,
                 'context': self.context,
                 'execution_time': execution_time,
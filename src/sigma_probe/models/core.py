@@ -6,14 +6,317 @@ SIGMA-PROBE Core Data Models
 """
 
 import re
+import sys
 import math
+import time
+from array import array
+from collections.abc import Mapping, Sequence, ValuesView
 from datetime import datetime
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Any, Optional
 from ipaddress import IPv4Address
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+from pydantic_core import core_schema
 from dataclasses import dataclass
 from collections import Counter
 
+import numpy as np
+
+
+def _any_of(*patterns: str) -> 're.Pattern[str]':
+    """One case-insensitive regex matching wherever any of ``patterns`` does"""
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+
+
+# Heuristic patterns of LogEvent._apply_heuristics, compiled once at import
+_LFI_RE = _any_of(
+    r'\.\./', r'\.\.\\',  # Directory traversal
+    r'file://', r'ftp://', r'http://',  # Remote file inclusion
+    r'php://', r'data://', r'zip://',  # PHP wrappers
+)
+
+_SQLI_RE = _any_of(
+    r'(\'|\")(\s|%20)*(OR|AND)(\s|%20)*(\d+|\'[^\']*\')',
+    r'UNION(\s|%20)*SELECT',
+    r'DROP(\s|%20)*TABLE',
+    r'EXEC(\s|%20)*xp_',
+)
+
+_XSS_RE = _any_of(
+    r'<script[^>]*>',
+    r'javascript:',
+    r'on\w+\s*=',
+    r'<iframe[^>]*>',
+    r'<object[^>]*>',
+)
+
+# Command injection patterns. Two flavours:
+# 1. Shell metacharacters followed by a command name.
+# 2. Sensitive system paths or recognisable command tokens appearing
+#    in URL parameters (common in vulnerable cgi/exec endpoints, e.g.
+#    /exec.php?cmd=cat /etc/passwd).
+_CMD_RE = _any_of(
+    r'(\||&|;|`|\$\(|\$\{)\s*(cat|ls|pwd|whoami|id|uname)\b',
+    r'(\||&|;|`|\$\(|\$\{)\s*(wget|curl|nc|telnet|bash|sh)\b',
+    r'(\||&|;|`|\$\(|\$\{)\s*(rm|del|format|chmod|chown)\b',
+    r'/etc/passwd|/etc/shadow|/proc/self/environ',
+    r'\b(cat|ls|whoami|uname)\b\s+/[A-Za-z]',
+)
+
+_UA_RE = _any_of(
+    r'bot|crawler|spider|scraper',
+    r'nmap|sqlmap|nikto|dirb',
+    r'python|curl|wget|lynx',
+)
+
+_FLAG_PATTERNS = (
+    ('LFI_RFI', _LFI_RE),
+    ('SQL_INJECTION', _SQLI_RE),
+    ('XSS', _XSS_RE),
+    ('COMMAND_INJECTION', _CMD_RE),
+)
+
+# From this many URLs get_behavioral_vector selects the top 50 with NumPy
+_NUMPY_TOP_MIN_URLS = 512
+
+# log2 of small integers, for URL entropy from integer character counts
+_LOG2 = [0.0] + [math.log2(i) for i in range(1, 4097)]
+
+_SUSPICIOUS_EXTENSIONS = (
+    '.php', '.asp', '.aspx', '.jsp', '.cgi', '.pl', '.py',
+    '.exe', '.bat', '.cmd', '.com', '.pif', '.scr',
+)
+
+def format_details(details: Any) -> Any:
+    """Materialize evidence details stored as a deferred ``(fmt, args)`` pair.
+
+    Hot paths record ``("Final threat score: {:.2f}", (score,))`` instead
+    of an f-string, so the text is only built for entries that are read.
+    Anything else is returned unchanged.
+    """
+    if type(details) is tuple:
+        fmt, args = details
+        return fmt.format(*args)
+    return details
+
+
+class EvidenceEntry(NamedTuple):
+    """One evidence trail entry, as yielded by :meth:`EvidenceTrail.entries`"""
+    timestamp: str
+    source: str
+    type: str
+    details: Any
+    confidence: float
+
+
+class EvidenceTrail(Sequence):
+    """Evidence trail stored as parallel columns instead of one dict per entry.
+
+    ``add`` appends to ``sources``, ``types``, ``details``, ``confidences``
+    (``array('d')``) and ``timestamps`` (epoch seconds, ``array('d')``).
+    Reading still behaves like the old ``List[Dict]``: indexing, iteration
+    and slicing build the same dicts on the fly. Those dicts are copies:
+    editing one (``trail[i]['confidence'] = x``) does not change the trail,
+    and :meth:`set_confidence` is the only way to update a stored entry.
+    Scans that need one field per entry should read the columns (or
+    :meth:`get_field`) instead of materializing every dict.
+
+    Entries appended as ready-made dicts (``append``) keep their own keys
+    and are returned as they were given; their source and confidence are
+    mirrored into the columns.
+    
+    ``details`` may hold deferred ``(fmt, args)`` pairs (see
+    :func:`format_details`); entries read back carry the formatted text.
+    """
+    
+    __slots__ = ('timestamps', 'sources', 'types', 'details', 'confidences', '_raw')
+    
+    def __init__(self, entries: Iterable[Mapping[str, Any]] = ()):
+        self.timestamps = array('d')
+        self.sources: List[str] = []
+        self.types: List[str] = []
+        self.details: List[Any] = []
+        self.confidences = array('d')
+        # Position -> dict for entries appended as dicts
+        self._raw: Dict[int, Dict[str, Any]] = {}
+        for entry in entries:
+            self.append(entry)
+    
+    def add(self, source: str, evidence_type: str, details: Any, confidence: float = 1.0) -> None:
+        """Append an entry stamped with the current time"""
+        self.timestamps.append(time.time())
+        self.sources.append(source)
+        self.types.append(evidence_type)
+        self.details.append(details)
+        self.confidences.append(confidence)
+    
+    def append(self, entry: Mapping[str, Any]) -> None:
+        """Append a dict entry as-is (kept for callers building their own dicts)"""
+        entry = dict(entry)
+        self._raw[len(self.sources)] = entry
+        self.timestamps.append(math.nan)
+        self.sources.append(entry.get('source', ''))
+        self.types.append(entry.get('type', ''))
+        self.details.append(entry.get('details', ''))
+        self.confidences.append(entry.get('confidence', 0.0))
+    
+    def set_confidence(self, index: int, confidence: float) -> None:
+        """Overwrite the confidence of entry ``index`` (entries read back
+        are copies, so this is the only way to update one)"""
+        self.confidences[index] = confidence
+        raw = self._raw.get(index % len(self.sources))
+        if raw is not None:
+            raw['confidence'] = confidence
+    
+    def get_field(self, index: int, key: str, default: Any = None) -> Any:
+        """``self[index].get(key, default)`` without building the entry dict"""
+        raw = self._raw.get(index)
+        if raw is not None:
+            return raw.get(key, default)
+        if key == 'source':
+            return self.sources[index]
+        if key == 'type':
+            return self.types[index]
+        if key == 'details':
+            return format_details(self.details[index])
+        if key == 'confidence':
+            return self.confidences[index]
+        if key == 'timestamp':
+            return self._timestamp(index)
+        return default
+    
+    def entries(self) -> Iterator[EvidenceEntry]:
+        """Iterate over the entries as :class:`EvidenceEntry` tuples"""
+        for i in range(len(self.sources)):
+            yield EvidenceEntry(self._timestamp(i), self.sources[i], self.types[i],
+                                format_details(self.details[i]), self.confidences[i])
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """The trail as a list of dicts (for reports and serialization)"""
+        return [self._entry(i) for i in range(len(self.sources))]
+    
+    def _timestamp(self, index: int) -> str:
+        raw = self._raw.get(index)
+        if raw is not None:
+            return raw.get('timestamp', '')
+        return datetime.fromtimestamp(self.timestamps[index]).isoformat()
+    
+    def _entry(self, index: int) -> Dict[str, Any]:
+        raw = self._raw.get(index)
+        if raw is not None:
+            return dict(raw)
+        return {
+            'timestamp': self._timestamp(index),
+            'source': self.sources[index],
+            'type': self.types[index],
+            'details': format_details(self.details[index]),
+            'confidence': self.confidences[index]
+        }
+    
+    def __len__(self) -> int:
+        return len(self.sources)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self.sources)))]
+        if index < 0:
+            index += len(self.sources)
+        if not 0 <= index < len(self.sources):
+            raise IndexError('evidence trail index out of range')
+        return self._entry(index)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self.sources)):
+            yield self._entry(i)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (EvidenceTrail, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"EvidenceTrail({self.to_list()!r})"
+    
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        """Accept a trail or a list of dicts; serialize as a list of dicts"""
+        return core_schema.no_info_plain_validator_function(
+            lambda value: value if isinstance(value, cls) else cls(value),
+            serialization=core_schema.plain_serializer_function_ser_schema(cls.to_list)
+        )
+
+class _FrequencyValues(ValuesView):
+    """Values of a :class:`UrlFrequencies` without a lookup per URL"""
+    __slots__ = ()
+    
+    def __iter__(self) -> Iterator[float]:
+        total = self._mapping.total
+        return (count / total for count in self._mapping.counts.values())
+
+
+class UrlFrequencies(Mapping):
+    """URL -> share of requests, computed on read from running counts.
+
+    ``add`` bumps one count and the total, so keeping an actor's frequency
+    vector current costs O(1) per event instead of rebuilding a dict over
+    every unique URL. The ratios are the same ``count / total`` values the
+    rebuilt dict held.
+    """
+    __slots__ = ('counts', 'total')
+    
+    def __init__(self, counts: Optional[Mapping[str, float]] = None, total: Optional[float] = None):
+        self.counts = Counter() if counts is None else counts
+        self.total = sum(self.counts.values()) if total is None else total
+    
+    def add(self, url: str) -> None:
+        self.counts[url] += 1
+        self.total += 1
+    
+    def to_dict(self) -> Dict[str, float]:
+        total = self.total
+        return {url: count / total for url, count in self.counts.items()}
+    
+    def __getitem__(self, url: str) -> float:
+        if url not in self.counts:
+            raise KeyError(url)
+        return self.counts[url] / self.total
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.counts)
+    
+    def __len__(self) -> int:
+        return len(self.counts)
+    
+    def values(self) -> ValuesView:
+        return _FrequencyValues(self)
+    
+    def __repr__(self) -> str:
+        return f"UrlFrequencies({self.to_dict()!r})"
+    
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        """Accept frequencies or a plain {url: ratio} dict; serialize as a dict"""
+        return core_schema.no_info_plain_validator_function(
+            lambda value: value if isinstance(value, cls) else cls(
+                {str(url): float(ratio) for url, ratio in dict(value).items()}, 1.0
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda value: value.to_dict() if isinstance(value, cls) else dict(value)
+            )
+        )
 
 class LogEvent(BaseModel):
     """Enhanced log event with built-in feature calculation capabilities"""
@@ -38,116 +341,55 @@ class LogEvent(BaseModel):
     
     def calculate_features(self) -> None:
         """Calculate all features for this event"""
-        self._calculate_entropy()
         self._calculate_url_features()
         self._apply_heuristics()
     
-    def _calculate_entropy(self) -> None:
-        """Calculate Shannon entropy of the URL"""
-        if not self.url:
-            self.entropy = 0.0
-            return
-            
-        # Count character frequencies
-        char_counts = Counter(self.url)
-        total_chars = len(self.url)
+    def _calculate_url_features(self) -> None:
+        """Calculate Shannon entropy and structural features of the URL in one pass.
+
+        The character histogram (Counter) and the single split at the first
+        '?' are shared by every feature, instead of re-scanning the URL for
+        each one.
+        """
+        url = self.url
+        total_chars = len(url)
+        self.url_length = total_chars
         
-        # Calculate entropy
-        entropy = 0.0
-        for count in char_counts.values():
-            if count > 0:
+        # Shannon entropy from character frequencies:
+        # H = log2(L) - sum(c * log2(c)) / L, with log2 of the integer counts
+        # read from a table for URLs up to _LOG2 size
+        char_counts = Counter(url).values()
+        if total_chars < len(_LOG2):
+            weighted = 0.0
+            for count in char_counts:
+                weighted += count * _LOG2[count]
+            self.entropy = _LOG2[total_chars] - weighted / total_chars if total_chars else 0.0
+        else:
+            entropy = 0.0
+            for count in char_counts:
                 p = count / total_chars
                 entropy -= p * math.log2(p)
+            self.entropy = entropy
         
-        self.entropy = entropy
-    
-    def _calculate_url_features(self) -> None:
-        """Calculate URL-based features"""
-        self.url_length = len(self.url)
-        
-        # Calculate path depth
-        path = self.url.split('?')[0]  # Remove query parameters
+        # Path depth (query parameters removed) and query parameter count
+        path, has_query, query = url.partition('?')
         self.path_depth = len([p for p in path.split('/') if p])
-        
-        # Count query parameters
-        if '?' in self.url:
-            query_part = self.url.split('?')[1]
-            self.query_params_count = len(query_part.split('&'))
-        else:
-            self.query_params_count = 0
+        self.query_params_count = query.partition('?')[0].count('&') + 1 if has_query else 0
     
     def _apply_heuristics(self) -> None:
         """Apply heuristic rules to detect suspicious patterns"""
         self.heuristic_flags.clear()
+        url = self.url
         
-        # LFI/RFI patterns
-        lfi_patterns = [
-            r'\.\./', r'\.\.\\',  # Directory traversal
-            r'file://', r'ftp://', r'http://',  # Remote file inclusion
-            r'php://', r'data://', r'zip://'   # PHP wrappers
-        ]
-        
-        for pattern in lfi_patterns:
-            if re.search(pattern, self.url, re.IGNORECASE):
-                self.heuristic_flags.add('LFI_RFI')
-                break
-        
-        # SQL Injection patterns
-        sql_patterns = [
-            r'(\'|\")(\s|%20)*(OR|AND)(\s|%20)*(\d+|\'[^\']*\')',
-            r'UNION(\s|%20)*SELECT',
-            r'DROP(\s|%20)*TABLE',
-            r'EXEC(\s|%20)*xp_',
-            r'(\'|\")(\s|%20)*(OR|AND)(\s|%20)*(\d+|\'[^\']*\')'
-        ]
-        
-        for pattern in sql_patterns:
-            if re.search(pattern, self.url, re.IGNORECASE):
-                self.heuristic_flags.add('SQL_INJECTION')
-                break
-        
-        # XSS patterns
-        xss_patterns = [
-            r'<script[^>]*>',
-            r'javascript:',
-            r'on\w+\s*=',
-            r'<iframe[^>]*>',
-            r'<object[^>]*>'
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, self.url, re.IGNORECASE):
-                self.heuristic_flags.add('XSS')
-                break
-        
-        # Command injection patterns. Two flavours:
-        # 1. Shell metacharacters followed by a command name.
-        # 2. Sensitive system paths or recognisable command tokens appearing
-        #    in URL parameters (common in vulnerable cgi/exec endpoints, e.g.
-        #    /exec.php?cmd=cat /etc/passwd).
-        cmd_patterns = [
-            r'(\||&|;|`|\$\(|\$\{)\s*(cat|ls|pwd|whoami|id|uname)\b',
-            r'(\||&|;|`|\$\(|\$\{)\s*(wget|curl|nc|telnet|bash|sh)\b',
-            r'(\||&|;|`|\$\(|\$\{)\s*(rm|del|format|chmod|chown)\b',
-            r'/etc/passwd|/etc/shadow|/proc/self/environ',
-            r'\b(cat|ls|whoami|uname)\b\s+/[A-Za-z]',
-        ]
-
-        for pattern in cmd_patterns:
-            if re.search(pattern, self.url, re.IGNORECASE):
-                self.heuristic_flags.add('COMMAND_INJECTION')
-                break
+        # LFI/RFI, SQL injection, XSS and command injection
+        for flag, regex in _FLAG_PATTERNS:
+            if regex.search(url):
+                self.heuristic_flags.add(flag)
         
         # Suspicious file extensions
-        suspicious_extensions = [
-            '.php', '.asp', '.aspx', '.jsp', '.cgi', '.pl', '.py',
-            '.exe', '.bat', '.cmd', '.com', '.pif', '.scr'
-        ]
-        
-        for ext in suspicious_extensions:
-            if ext.lower() in self.url.lower():
-                self.heuristic_flags.add('SUSPICIOUS_EXTENSION')
-                break
+        url_lower = url.lower()
+        if any(ext in url_lower for ext in _SUSPICIOUS_EXTENSIONS):
+            self.heuristic_flags.add('SUSPICIOUS_EXTENSION')
         
         # High entropy (encrypted/encoded content)
         if self.entropy and self.entropy > 4.5:
@@ -162,17 +404,8 @@ class LogEvent(BaseModel):
             self.heuristic_flags.add('MANY_PARAMS')
         
         # Suspicious user agents
-        if self.user_agent:
-            suspicious_ua_patterns = [
-                r'bot|crawler|spider|scraper',
-                r'nmap|sqlmap|nikto|dirb',
-                r'python|curl|wget|lynx'
-            ]
-            
-            for pattern in suspicious_ua_patterns:
-                if re.search(pattern, self.user_agent, re.IGNORECASE):
-                    self.heuristic_flags.add('SUSPICIOUS_USER_AGENT')
-                    break
+        if self.user_agent and _UA_RE.search(self.user_agent):
+            self.heuristic_flags.add('SUSPICIOUS_USER_AGENT')
         
         # Set overall suspicious flag
         self.is_suspicious = len(self.heuristic_flags) > 0
@@ -197,76 +430,150 @@ class ActorProfile(BaseModel):
     tags: Set[str] = Field(default_factory=set)
     
     # Evidence trail
-    evidence_trail: List[Dict[str, Any]] = Field(default_factory=list)
+    evidence_trail: EvidenceTrail = Field(default_factory=EvidenceTrail)
     
     # Behavioral vector for clustering
-    url_frequency_vector: Dict[str, float] = Field(default_factory=dict)
+    url_frequency_vector: UrlFrequencies = Field(default_factory=UrlFrequencies)
     behavioral_signatures: Dict[str, Any] = Field(default_factory=dict)
 
+    # Running aggregates behind add_event: the events list they were counted
+    # from and its length, URL counts, entropy sum and count
+    _counted_list: Optional[List[LogEvent]] = PrivateAttr(default=None)
+    _counted_events: int = PrivateAttr(default=0)
+    _url_counts: UrlFrequencies = PrivateAttr(default_factory=UrlFrequencies)
+    _entropy_sum: float = PrivateAttr(default=0.0)
+    _entropy_count: int = PrivateAttr(default=0)
+    # Event timestamps (epoch seconds) as a column, in event order, and the
+    # events list it was built from
+    _timestamps: array = PrivateAttr(default_factory=lambda: array('d'))
+    _timestamps_list: Optional[List[LogEvent]] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Aggregates start out counted from the initial (usually empty) list;
+        # a non-empty one is picked up by the length checks
+        self._counted_list = self._timestamps_list = self.events
+
     def add_event(self, event: LogEvent) -> None:
         """Add an event to the profile and refresh aggregate metrics.
 
         Keeping metrics in sync here avoids consumers having to remember to
         call ``calculate_metrics`` after every append, which was a frequent
-        source of stale-state bugs in earlier versions.
+        source of stale-state bugs in earlier versions. Metrics are updated
+        incrementally from running aggregates. They are rebuilt from scratch
+        instead when ``events`` was reassigned or changed length since the
+        last update. Elements replaced in place are not detected; call
+        ``calculate_metrics`` after editing ``events`` that way.
         """
+        if self._timestamps_list is self.events and len(self._timestamps) == len(self.events):
+            self._timestamps.append(event.timestamp.timestamp())
+        
+        if self._counted_list is not self.events or self._counted_events != len(self.events):
+            self.events.append(event)
+            self.calculate_metrics()
+            return
+        
         self.events.append(event)
-        self.calculate_metrics()
+        self._counted_events = self.total_requests = len(self.events)
+        
+        # URL diversity. The counted URL is interned so that repeated URLs
+        # share one key string and the lookup hits the identity fast path;
+        # the caller's event is left as is
+        url = sys.intern(event.url)
+        url_counts = self._url_counts
+        url_counts.add(url)
+        self.unique_urls = len(url_counts)
+        self.url_diversity_ratio = self.unique_urls / self.total_requests
+        
+        # Entropy metrics
+        if event.entropy is not None:
+            self._entropy_sum += event.entropy
+            self._entropy_count += 1
+            self.avg_entropy = self._entropy_sum / self._entropy_count
+            self.max_entropy = event.entropy if self._entropy_count == 1 else max(self.max_entropy, event.entropy)
+        
+        # URL frequency vector for clustering: a view of the running counts
+        self.url_frequency_vector = url_counts
 
     def calculate_metrics(self) -> None:
         """Calculate behavioral metrics"""
-        self.total_requests = len(self.events)
+        self._counted_list = self.events
+        self._counted_events = self.total_requests = len(self.events)
         
         # URL diversity
-        unique_urls = set(event.url for event in self.events)
-        self.unique_urls = len(unique_urls)
+        self._url_counts = UrlFrequencies(Counter(event.url for event in self.events), self.total_requests)
+        self.unique_urls = len(self._url_counts)
         self.url_diversity_ratio = self.unique_urls / self.total_requests if self.total_requests > 0 else 0.0
         
         # Entropy metrics
         entropies = [event.entropy for event in self.events if event.entropy is not None]
+        self._entropy_sum = sum(entropies)
+        self._entropy_count = len(entropies)
         if entropies:
-            self.avg_entropy = sum(entropies) / len(entropies)
+            self.avg_entropy = self._entropy_sum / self._entropy_count
             self.max_entropy = max(entropies)
         
-        # Build URL frequency vector for clustering
-        url_counts = Counter(event.url for event in self.events)
-        total_events = len(self.events)
-        self.url_frequency_vector = {
-            url: count / total_events 
-            for url, count in url_counts.items()
-        }
+        # URL frequency vector for clustering
+        self.url_frequency_vector = self._url_counts
     
-    def add_evidence(self, source: str, evidence_type: str, details: str, confidence: float = 1.0) -> None:
-        """Add evidence to the trail"""
-        self.evidence_trail.append({
-            'timestamp': datetime.now().isoformat(),
-            'source': source,
-            'type': evidence_type,
-            'details': details,
-            'confidence': confidence
-        })
+    def timestamp_array(self) -> np.ndarray:
+        """Event timestamps in epoch seconds, in event order.
+
+        Served from the column kept by ``add_event``; the column is rebuilt
+        when ``events`` was reassigned or changed length. Elements replaced
+        in place are not detected. Returns a copy, so later appends are not
+        blocked by an exported buffer.
+        """
+        if self._timestamps_list is not self.events or len(self._timestamps) != len(self.events):
+            self._timestamps = array('d', (event.timestamp.timestamp() for event in self.events))
+            self._timestamps_list = self.events
+        return np.array(self._timestamps, dtype=np.float64)
+    
+    def add_evidence(self, source: str, evidence_type: str, details: Any, confidence: float = 1.0) -> None:
+        """Add evidence to the trail.
+
+        ``details`` is a string or a deferred ``(fmt, args)`` pair that is
+        formatted only when the entry is read (see :func:`format_details`).
+        """
+        self.evidence_trail.add(source, evidence_type, details, confidence)
+    
+    def iter_evidence(self) -> Iterator[EvidenceEntry]:
+        """Iterate over the evidence trail as named tuples"""
+        return self.evidence_trail.entries()
     
     def add_tag(self, tag: str, source: str = "unknown") -> None:
         """Add a tag to the actor"""
         self.tags.add(tag)
-        self.add_evidence(source, "tag_added", f"Added tag: {tag}")
+        self.add_evidence(source, "tag_added", ("Added tag: {}", (tag,)))
+    
+    def finalize(self) -> None:
+        """Normalize tags once detection, scoring and clustering are done.
+
+        Reporting, recommendations and MITRE mapping only test membership
+        and intersect tag sets; if a stage assigned ``tags`` as a list or
+        another iterable, it becomes a ``set`` again, so lookups stay O(1)
+        and ``actor.tags.add(...)`` keeps working afterwards.
+        """
+        if type(self.tags) is not set:
+            self.tags = set(self.tags)
     
     def get_behavioral_vector(self) -> List[float]:
         """Get normalized behavioral vector for clustering"""
-        # Normalize URL frequency vector to fixed size
-        top_urls = sorted(self.url_frequency_vector.items(), key=lambda x: x[1], reverse=True)[:50]
-        
-        # Pad or truncate to 50 dimensions
-        vector = [freq for _, freq in top_urls]
-        while len(vector) < 50:
-            vector.append(0.0)
-        vector = vector[:50]
+        # Top 50 URL frequencies in descending order. Only the values are
+        # needed; with many URLs NumPy selects them with a partial sort.
+        frequencies = self.url_frequency_vector.values()
+        if len(frequencies) < _NUMPY_TOP_MIN_URLS:
+            vector = sorted(frequencies, reverse=True)[:50]
+        else:
+            values = np.fromiter(frequencies, dtype=np.float64, count=len(frequencies))
+            vector = np.sort(np.partition(values, len(values) - 50)[-50:])[::-1].tolist()
         
-        # Normalize
+        # Normalize (summed in descending order, as before)
         total = sum(vector)
         if total > 0:
             vector = [v / total for v in vector]
         
+        # Pad to 50 dimensions
+        vector.extend([0.0] * (50 - len(vector)))
         return vector
 
 
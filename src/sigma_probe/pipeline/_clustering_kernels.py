@@ -0,0 +1,44 @@
+"""
+SIGMA-PROBE clustering kernels.
+
+Behavioral matrix construction for :meth:`ScoringEngine.cluster_campaigns`.
+Each actor's URL frequencies are passed as one flat array with per-actor
+offsets (CSR layout), so the whole matrix is built in a single compiled
+loop instead of one ``ActorProfile.get_behavioral_vector`` call per actor.
+"""
+
+import numpy as np
+
+from ._jit import njit, prange
+
+# Width of ActorProfile.get_behavioral_vector
+BEHAVIORAL_VECTOR_SIZE = 50
+
+
+@njit(parallel=True, cache=True)
+def _behavioral_matrix(frequencies, offsets, out):
+    """Fill ``out[i]`` with actor ``i``'s behavioral vector.
+
+    Mirrors ``get_behavioral_vector``: the top ``out.shape[1]`` frequencies
+    in descending order, zero padded and divided by their sum (summed in the
+    same order, so the values are identical). Returns the per-row sums; rows
+    with a zero sum carry no behavior.
+    """
+    n, dims = out.shape
+    totals = np.zeros(n, np.float64)
+
+    for i in prange(n):
+        row = np.sort(frequencies[offsets[i]:offsets[i + 1]])[::-1]
+        k = min(dims, row.shape[0])
+
+        total = 0.0
+        for j in range(k):
+            total += row[j]
+        totals[i] = total
+
+        for j in range(k):
+            out[i, j] = row[j] / total if total > 0 else row[j]
+        for j in range(k, dims):
+            out[i, j] = 0.0
+
+    return totals
@@ -0,0 +1,39 @@
+"""
+SIGMA-PROBE detector kernels.
+
+Numeric inner loops of the detectors in :mod:`sigma_probe.pipeline.detectors`,
+written against flat NumPy arrays so that Numba can compile them when it is
+available.
+"""
+
+import numpy as np
+
+from ._jit import njit
+
+
+@njit(cache=True)
+def _interval_cv(timestamps):
+    """Coefficient of variation of the gaps between sorted timestamps.
+
+    Equivalent to ``np.diff`` followed by ``std() / mean()``, without the
+    intermediate intervals array: one pass accumulates the mean, a second
+    the squared deviations. Returns NaN when there are no intervals or
+    their mean is not positive.
+    """
+    n = timestamps.shape[0] - 1
+    if n < 1:
+        return np.nan
+
+    total = 0.0
+    for i in range(n):
+        total += timestamps[i + 1] - timestamps[i]
+    mean = total / n
+    if not mean > 0:
+        return np.nan
+
+    squares = 0.0
+    for i in range(n):
+        deviation = timestamps[i + 1] - timestamps[i] - mean
+        squares += deviation * deviation
+
+    return np.sqrt(squares / n) / mean
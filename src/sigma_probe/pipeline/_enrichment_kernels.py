@@ -0,0 +1,34 @@
+"""
+SIGMA-PROBE enrichment kernels.
+
+Numeric inner loops of :class:`ActorEnrichmentStage`, written against flat
+NumPy arrays so that Numba can compile them when it is available.
+"""
+
+import numpy as np
+
+from ._jit import njit
+
+
+@njit(cache=True)
+def _agg(timestamps, status_codes, method_ids, n_status, n_methods):
+    """Single pass over an actor's events.
+
+    Returns ``(method_counts, status_counts, tmin, tmax)`` where the count
+    arrays are bincounts indexed by method id / status code.
+    """
+    method_counts = np.zeros(n_methods, np.int64)
+    status_counts = np.zeros(n_status, np.int64)
+    tmin = timestamps[0]
+    tmax = timestamps[0]
+
+    for i in range(timestamps.shape[0]):
+        method_counts[method_ids[i]] += 1
+        status_counts[status_codes[i]] += 1
+        t = timestamps[i]
+        if t < tmin:
+            tmin = t
+        elif t > tmax:
+            tmax = t
+
+    return method_counts, status_counts, tmin, tmax
@@ -0,0 +1,29 @@
+"""
+SIGMA-PROBE optional JIT support.
+
+Numba is an optional dependency (``pip install sigma-probe[speedups]``).
+When it is not installed ``njit`` degrades to a no-op decorator and
+``prange`` to ``range``, so every kernel still runs as plain Python/NumPy
+and produces identical results — only slower.
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for :func:`numba.njit`."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ['njit', 'prange', 'NUMBA_AVAILABLE']
@@ -0,0 +1,126 @@
+"""
+SIGMA-PROBE scoring kernels.
+
+Numeric core of :meth:`ScoringRulesEngine.calculate_scores_batch`: the
+per-tag base scores with their modifiers, then the dynamic combination,
+contextual and global modifiers applied to them. ``_base_score_kernel`` and
+``_score_kernel`` are fused loops meant for Numba; ``_base_score_vectorized``
+and ``_score_vectorized`` are the NumPy formulations used when Numba is not
+installed. Each pair applies the multiplications in the same order and
+therefore returns identical results.
+
+Summary scalars that are absent from the context are passed as values
+that leave the modifier untouched (``prevalence=0.0``, ``anomaly_rate=0.0``,
+``largest_cluster=0``, ``has_graph=False``).
+"""
+
+import numpy as np
+
+from ._jit import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def _base_score_kernel(has_profile, profile_base, modifier_offsets, modifier_values, fired):
+    """Sum of per-tag scores, each multiplied by the modifiers that fired.
+
+    ``has_profile`` is N x P (actor has the scored tag), ``fired`` is N x M
+    with the modifiers of profile ``p`` in columns
+    ``modifier_offsets[p]:modifier_offsets[p + 1]``.
+    """
+    n, profiles = has_profile.shape
+    scores = np.zeros(n, np.float64)
+
+    for i in prange(n):
+        score = 0.0
+        for p in range(profiles):
+            if not has_profile[i, p]:
+                continue
+            tag_score = profile_base[p]
+            for m in range(modifier_offsets[p], modifier_offsets[p + 1]):
+                if fired[i, m]:
+                    tag_score *= modifier_values[m]
+            score += tag_score
+        scores[i] = score
+
+    return scores
+
+
+def _base_score_vectorized(has_profile, profile_base, modifier_offsets, modifier_values, fired):
+    """Same computation as :func:`_base_score_kernel` with whole-column operations."""
+    n, profiles = has_profile.shape
+    scores = np.zeros(n)
+
+    for p in range(profiles):
+        tag_mask = has_profile[:, p]
+        if not tag_mask.any():
+            continue
+        tag_score = np.full(n, profile_base[p], dtype=np.float64)
+        for m in range(modifier_offsets[p], modifier_offsets[p + 1]):
+            tag_score = np.where(fired[:, m], tag_score * modifier_values[m], tag_score)
+        scores += np.where(tag_mask, tag_score, 0.0)
+
+    return scores
+
+
+@njit(cache=True)
+def _score_kernel(base, combination, explicit_matched, dynamic_index, dynamic_lut,
+                  automated_scan, coordinated, centrality, anomaly_ratio,
+                  prevalence, has_graph, avg_centrality, anomaly_rate,
+                  largest_cluster, global_modifier):
+    """Final scores in a single pass over the actors."""
+    n = base.shape[0]
+    scores = np.empty(n, np.float64)
+
+    for i in range(n):
+        combination_modifier = combination[i]
+        if not explicit_matched[i]:
+            combination_modifier *= dynamic_lut[dynamic_index[i]]
+
+        contextual_modifier = 1.0
+        if prevalence > 0.5:
+            if automated_scan[i]:
+                contextual_modifier *= 1.2
+            else:
+                contextual_modifier *= 0.8
+        if has_graph:
+            if avg_centrality > 0 and centrality[i] > avg_centrality * 2:
+                contextual_modifier *= 1.3
+            elif centrality[i] < avg_centrality * 0.5:
+                contextual_modifier *= 0.9
+        if anomaly_rate > 0.3:
+            if anomaly_ratio[i] > 0.7:
+                contextual_modifier *= 1.4
+            else:
+                contextual_modifier *= 0.7
+        if largest_cluster >= 5 and coordinated[i]:
+            contextual_modifier *= 1.5
+
+        scores[i] = base[i] * combination_modifier * contextual_modifier * global_modifier
+
+    return scores
+
+
+def _score_vectorized(base, combination, explicit_matched, dynamic_index, dynamic_lut,
+                      automated_scan, coordinated, centrality, anomaly_ratio,
+                      prevalence, has_graph, avg_centrality, anomaly_rate,
+                      largest_cluster, global_modifier):
+    """Same computation as :func:`_score_kernel` with whole-array operations."""
+    combination_modifier = np.where(explicit_matched, combination,
+                                    combination * dynamic_lut[dynamic_index])
+
+    contextual_modifier = np.ones(base.shape[0])
+    if prevalence > 0.5:
+        contextual_modifier = np.where(automated_scan, contextual_modifier * 1.2,
+                                       contextual_modifier * 0.8)
+    if has_graph:
+        high = (centrality > avg_centrality * 2) if avg_centrality > 0 else np.zeros(base.shape[0], dtype=bool)
+        low = ~high & (centrality < avg_centrality * 0.5)
+        contextual_modifier = np.where(high, contextual_modifier * 1.3, contextual_modifier)
+        contextual_modifier = np.where(low, contextual_modifier * 0.9, contextual_modifier)
+    if anomaly_rate > 0.3:
+        contextual_modifier = np.where(anomaly_ratio > 0.7, contextual_modifier * 1.4,
+                                       contextual_modifier * 0.7)
+    if largest_cluster >= 5:
+        contextual_modifier = np.where(coordinated, contextual_modifier * 1.5, contextual_modifier)
+
+    return base * combination_modifier * contextual_modifier * global_modifier
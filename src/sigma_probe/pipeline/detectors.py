@@ -21,6 +21,8 @@ import networkx as nx
 import numpy as np
 
 from sigma_probe.models.core import ActorProfile
+from sigma_probe.pipeline._detector_kernels import _interval_cv
+from sigma_probe.pipeline._jit import NUMBA_AVAILABLE
 from sigma_probe.pipeline.base import Detector
 
 logger = logging.getLogger(__name__)
@@ -109,20 +111,19 @@ class FFTDetector(BaseDetector):
             event_count = len(actor.events)
 
             if event_count >= self.min_events_for_fft:
-                timestamps = sorted(e.timestamp.timestamp() for e in actor.events)
-                intervals = np.diff(np.asarray(timestamps, dtype=float))
-                if intervals.size and intervals.mean() > 0:
-                    cv = float(intervals.std() / intervals.mean())
-                    if cv < self.rhythmic_cv_threshold:
-                        actor.add_tag("AUTOMATED_SCAN", self.name)
-                        self.add_evidence(
-                            actor,
-                            "rhythmic_pattern",
-                            f"Near-constant request interval (cv={cv:.3f})",
-                            confidence=0.9,
-                        )
-                        rhythmic += 1
-                        continue
+                timestamps = np.sort(actor.timestamp_array())
+                cv = float(_interval_cv(timestamps) if NUMBA_AVAILABLE else self._interval_cv(timestamps))
+                # NaN (no usable intervals) never compares below the threshold
+                if cv < self.rhythmic_cv_threshold:
+                    actor.add_tag("AUTOMATED_SCAN", self.name)
+                    self.add_evidence(
+                        actor,
+                        "rhythmic_pattern",
+                        f"Near-constant request interval (cv={cv:.3f})",
+                        confidence=0.9,
+                    )
+                    rhythmic += 1
+                    continue
 
             # Manual scanning path: small number of events targeting known
             # admin paths.
@@ -149,6 +150,14 @@ class FFTDetector(BaseDetector):
             }
         }
 
+    @staticmethod
+    def _interval_cv(timestamps: np.ndarray) -> float:
+        """NumPy twin of the ``_interval_cv`` kernel, used without Numba."""
+        intervals = np.diff(timestamps)
+        if intervals.size and intervals.mean() > 0:
+            return float(intervals.std() / intervals.mean())
+        return float("nan")
+
 
 class GraphDetector(BaseDetector):
     """Coordination-via-similarity detector.
@@ -316,7 +325,8 @@ class AnomalyDetector(BaseDetector):
     def _calculate_baseline(actors: List[ActorProfile]) -> Dict[str, float]:
         baseline: Dict[str, float] = {}
         for attr in ("avg_entropy", "url_diversity_ratio", "total_requests", "centrality"):
-            values = np.asarray([getattr(actor, attr) for actor in actors], dtype=float)
+            values = np.fromiter((getattr(actor, attr) for actor in actors),
+                                 dtype=float, count=len(actors))
             baseline[f"{attr}_mean"] = float(values.mean())
             baseline[f"{attr}_std"] = float(values.std())
         return baseline
@@ -4,13 +4,60 @@
 """
 
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Any, Iterator
 from urllib.parse import urlparse, parse_qs
 from ipaddress import IPv4Address
 from sigma_probe.models.core import LogEvent, PipelineContext
 from sigma_probe.pipeline.base import PipelineStage
 
+# Стандартный формат Nginx: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
+_NGINX_RE = re.compile(r'^(\S+) - \S+ \[([^\]]+)\] "(\S+) (\S+) \S+" (\d+) \d+ "([^"]*)" "([^"]*)"')
+
+# Стандартный формат Apache: %h %l %u %t "%r" %>s %b "%{Referer}i" "%{User-Agent}i"
+_APACHE_RE = re.compile(r'^(\S+) \S+ \S+ \[([^\]]+)\] "(\S+) (\S+) \S+" (\d+) \d+ "([^"]*)" "([^"]*)"')
+
+_CLF_TIME_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+
+@lru_cache(maxsize=64)
+def _clf_tzinfo(offset: str) -> timezone:
+    """tzinfo для смещения вида '+0300' (почти все строки лога делят одно смещение)"""
+    delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    return timezone(-delta if offset[0] == '-' else delta)
+
+
+def _fast_clf_timestamp(time_str: str) -> datetime:
+    """Разбор времени Common Log Format ('01/Jan/2024:12:34:56 +0000') без strptime.
+
+    Позиции полей фиксированы, поэтому время собирается срезами. Любое
+    отклонение от раскладки передается в datetime.strptime, который либо
+    разберет строку, либо выбросит ValueError как и раньше.
+    """
+    digits = time_str[0:2] + time_str[7:11] + time_str[12:14] + time_str[15:17] + time_str[18:20] + time_str[22:26]
+    if (len(time_str) != 26
+            or time_str[2] + time_str[6] + time_str[11] + time_str[14] + time_str[17] + time_str[20] != '//::: '
+            or time_str[21] not in '+-'
+            or time_str[24] > '5'  # минуты смещения >= 60 strptime отвергает
+            or not (digits.isascii() and digits.isdigit())
+            or time_str[3:6] not in _MONTHS):
+        return datetime.strptime(time_str, _CLF_TIME_FORMAT)
+    
+    try:
+        return datetime(
+            int(time_str[7:11]), _MONTHS[time_str[3:6]], int(time_str[0:2]),
+            int(time_str[12:14]), int(time_str[15:17]), int(time_str[18:20]),
+            tzinfo=_clf_tzinfo(time_str[21:26])
+        )
+    except ValueError:
+        return datetime.strptime(time_str, _CLF_TIME_FORMAT)
+
 
 class LogIngestionStage(PipelineStage):
     """Универсальный загрузчик логов"""
@@ -36,7 +83,9 @@ class LogIngestionStage(PipelineStage):
             raise ValueError(f"Неподдерживаемый формат: {self.format}")
         
         try:
-            with open(self.log_path, 'r', encoding='utf-8') as f:
+            # errors='replace': одиночный не-UTF-8 байт (например, в User-Agent)
+            # не должен обрывать загрузку всего файла
+            with open(self.log_path, 'r', encoding='utf-8', errors='replace') as f:
                 for line_num, line in enumerate(f, 1):
                     try:
                         event = parser(line.strip())
@@ -55,9 +104,7 @@ class LogIngestionStage(PipelineStage):
     
     def _parse_nginx(self, line: str) -> LogEvent:
         """Парсинг Nginx логов"""
-        # Стандартный формат Nginx: $remote_addr - $remote_user [$time_local] "$request" $status $body_bytes_sent "$http_referer" "$http_user_agent"
-        pattern = r'^(\S+) - \S+ \[([^\]]+)\] "(\S+) (\S+) \S+" (\d+) \d+ "([^"]*)" "([^"]*)"'
-        match = re.match(pattern, line)
+        match = _NGINX_RE.match(line)
         
         if not match:
             raise ValueError(f"Неверный формат Nginx лога: {line}")
@@ -65,7 +112,7 @@ class LogIngestionStage(PipelineStage):
         ip_str, time_str, method, url_raw, status_code, referer, user_agent = match.groups()
         
         # Парсинг времени
-        timestamp = datetime.strptime(time_str, '%d/%b/%Y:%H:%M:%S %z')
+        timestamp = _fast_clf_timestamp(time_str)
         
         # Нормализация URL
         url_normalized = self._normalize_url(url_raw)
@@ -82,9 +129,7 @@ class LogIngestionStage(PipelineStage):
     
     def _parse_apache(self, line: str) -> LogEvent:
         """Парсинг Apache логов"""
-        # Стандартный формат Apache: %h %l %u %t "%r" %>s %b "%{Referer}i" "%{User-Agent}i"
-        pattern = r'^(\S+) \S+ \S+ \[([^\]]+)\] "(\S+) (\S+) \S+" (\d+) \d+ "([^"]*)" "([^"]*)"'
-        match = re.match(pattern, line)
+        match = _APACHE_RE.match(line)
         
         if not match:
             raise ValueError(f"Неверный формат Apache лога: {line}")
@@ -92,7 +137,7 @@ class LogIngestionStage(PipelineStage):
         ip_str, time_str, method, url_raw, status_code, referer, user_agent = match.groups()
         
         # Парсинг времени Apache
-        timestamp = datetime.strptime(time_str, '%d/%b/%Y:%H:%M:%S %z')
+        timestamp = _fast_clf_timestamp(time_str)
         
         # Нормализация URL
         url_normalized = self._normalize_url(url_raw)
@@ -7,7 +7,7 @@ SIGMA-PROBE MetaDetector
 """
 
 import logging
-from typing import Dict, List, Any, Set
+from typing import Dict, Iterator, List, Any, Set
 from collections import defaultdict
 
 from sigma_probe.models.core import ActorProfile, LogEvent
@@ -41,9 +41,12 @@ class MetaDetector(BaseDetector):
             if not actor.evidence_trail:
                 continue
                 
-            # Analyze evidence trail for confirmations and contradictions
-            confirmations = self._find_confirmations(actor)
-            contradictions = self._find_contradictions(actor)
+            # Analyze evidence trail for confirmations and contradictions.
+            # Source names are read once from the trail's source column
+            # instead of materializing every entry dict for each check
+            sources = set(actor.evidence_trail.sources)
+            confirmations = self._find_confirmations(actor, sources)
+            contradictions = self._find_contradictions(actor, sources)
             
             # Apply meta-analysis results
             self._apply_confirmations(actor, confirmations)
@@ -62,12 +65,12 @@ class MetaDetector(BaseDetector):
         logger.info(f"Meta-detection complete: {meta_analysis_results}")
         return actors
     
-    def _find_confirmations(self, actor: ActorProfile) -> List[Dict]:
+    def _find_confirmations(self, actor: ActorProfile, sources: Set[str]) -> List[Dict]:
         """Find confirming evidence patterns"""
         confirmations = []
         
         # Check for botnet confirmation
-        if self._confirm_botnet(actor):
+        if self._confirm_botnet(sources):
             confirmations.append({
                 'type': 'CONFIRMED_BOTNET',
                 'confidence': 0.95,
@@ -76,7 +79,7 @@ class MetaDetector(BaseDetector):
             })
         
         # Check for coordinated attack confirmation
-        if self._confirm_coordinated_attack(actor):
+        if self._confirm_coordinated_attack(sources):
             confirmations.append({
                 'type': 'CONFIRMED_COORDINATED',
                 'confidence': 0.9,
@@ -85,7 +88,7 @@ class MetaDetector(BaseDetector):
             })
         
         # Check for sophisticated attack confirmation
-        if self._confirm_sophisticated_attack(actor):
+        if self._confirm_sophisticated_attack(actor, sources):
             confirmations.append({
                 'type': 'CONFIRMED_SOPHISTICATED',
                 'confidence': 0.85,
@@ -95,7 +98,7 @@ class MetaDetector(BaseDetector):
         
         return confirmations
     
-    def _find_contradictions(self, actor: ActorProfile) -> List[Dict]:
+    def _find_contradictions(self, actor: ActorProfile, sources: Set[str]) -> List[Dict]:
         """Find contradictory evidence patterns"""
         contradictions = []
         
@@ -110,7 +113,7 @@ class MetaDetector(BaseDetector):
             })
         
         # Check for false positive patterns
-        if self._detect_false_positive_patterns(actor):
+        if self._detect_false_positive_patterns(actor, sources):
             contradictions.append({
                 'type': 'FALSE_POSITIVE',
                 'confidence': 0.7,
@@ -120,7 +123,7 @@ class MetaDetector(BaseDetector):
             })
         
         # Check for inconsistent timing
-        if self._detect_inconsistent_timing(actor):
+        if self._detect_inconsistent_timing(actor, sources):
             contradictions.append({
                 'type': 'INCONSISTENT_TIMING',
                 'confidence': 0.5,
@@ -131,38 +134,44 @@ class MetaDetector(BaseDetector):
         
         return contradictions
     
-    def _confirm_botnet(self, actor: ActorProfile) -> bool:
+    @staticmethod
+    def _has_source(sources: Set[str], name: str) -> bool:
+        """Whether any evidence source name mentions ``name``"""
+        return any(name in source for source in sources)
+    
+    @staticmethod
+    def _descriptions(actor: ActorProfile, name: str) -> Iterator[str]:
+        """Lower-cased descriptions of the evidence entries from source ``name``"""
+        trail = actor.evidence_trail
+        for i, source in enumerate(trail.sources):
+            if name in source:
+                yield trail.get_field(i, 'description', '').lower()
+    
+    def _confirm_botnet(self, sources: Set[str]) -> bool:
         """Confirm botnet activity through multiple detectors"""
-        has_fft = any('FFTDetector' in evidence.get('source', '') 
-                     for evidence in actor.evidence_trail)
-        has_clustering = any('BehavioralClusteringDetector' in evidence.get('source', '')
-                           for evidence in actor.evidence_trail)
-        has_anomaly = any('AnomalyDetector' in evidence.get('source', '')
-                         for evidence in actor.evidence_trail)
+        has_fft = self._has_source(sources, 'FFTDetector')
+        has_clustering = self._has_source(sources, 'BehavioralClusteringDetector')
+        has_anomaly = self._has_source(sources, 'AnomalyDetector')
         
         # Need at least 2 confirming detectors
         confirmations = sum([has_fft, has_clustering, has_anomaly])
         return confirmations >= 2
     
-    def _confirm_coordinated_attack(self, actor: ActorProfile) -> bool:
+    def _confirm_coordinated_attack(self, sources: Set[str]) -> bool:
         """Confirm coordinated attack through graph analysis"""
-        has_graph = any('GraphDetector' in evidence.get('source', '')
-                       for evidence in actor.evidence_trail)
-        has_anomaly = any('AnomalyDetector' in evidence.get('source', '')
-                         for evidence in actor.evidence_trail)
+        has_graph = self._has_source(sources, 'GraphDetector')
+        has_anomaly = self._has_source(sources, 'AnomalyDetector')
         
         # Need both graph and anomaly confirmation
         return has_graph and has_anomaly
     
-    def _confirm_sophisticated_attack(self, actor: ActorProfile) -> bool:
+    def _confirm_sophisticated_attack(self, actor: ActorProfile, sources: Set[str]) -> bool:
         """Confirm sophisticated attack with multiple vectors"""
         attack_tags = {'LFI_ATTACK', 'SQLI_ATTACK', 'XSS_ATTACK', 'PATH_TRAVERSAL'}
         detected_attacks = len(attack_tags.intersection(actor.tags))
         
-        has_heuristic = any('HeuristicEnricher' in evidence.get('source', '')
-                           for evidence in actor.evidence_trail)
-        has_temporal = any('FFTDetector' in evidence.get('source', '')
-                          for evidence in actor.evidence_trail)
+        has_heuristic = self._has_source(sources, 'HeuristicEnricher')
+        has_temporal = self._has_source(sources, 'FFTDetector')
         
         return detected_attacks >= 2 and (has_heuristic or has_temporal)
     
@@ -171,36 +180,31 @@ class MetaDetector(BaseDetector):
         attack_tags = {'LFI_ATTACK', 'SQLI_ATTACK', 'XSS_ATTACK', 'PATH_TRAVERSAL'}
         has_attack_tags = bool(attack_tags.intersection(actor.tags))
         
-        # Check if only heuristic evidence exists
-        only_heuristic = all('HeuristicEnricher' in evidence.get('source', '')
-                            for evidence in actor.evidence_trail)
-        
-        return has_attack_tags and only_heuristic and len(actor.evidence_trail) == 1
+        # A single entry, and it is heuristic evidence
+        trail = actor.evidence_trail
+        return has_attack_tags and len(trail) == 1 and 'HeuristicEnricher' in trail.sources[0]
     
-    def _detect_false_positive_patterns(self, actor: ActorProfile) -> bool:
+    def _detect_false_positive_patterns(self, actor: ActorProfile, sources: Set[str]) -> bool:
         """Detect patterns that suggest false positives"""
         # Check for normal behavior indicators
-        has_normal_anomaly = any('AnomalyDetector' in evidence.get('source', '') 
-                               and 'normal' in evidence.get('description', '').lower()
-                               for evidence in actor.evidence_trail)
+        has_normal_anomaly = self._has_source(sources, 'AnomalyDetector') and any(
+            'normal' in description for description in self._descriptions(actor, 'AnomalyDetector')
+        )
         
-        has_low_centrality = any('GraphDetector' in evidence.get('source', '')
-                               and 'low centrality' in evidence.get('description', '').lower()
-                               for evidence in actor.evidence_trail)
+        has_low_centrality = self._has_source(sources, 'GraphDetector') and any(
+            'low centrality' in description for description in self._descriptions(actor, 'GraphDetector')
+        )
         
         return has_normal_anomaly or has_low_centrality
     
-    def _detect_inconsistent_timing(self, actor: ActorProfile) -> bool:
+    def _detect_inconsistent_timing(self, actor: ActorProfile, sources: Set[str]) -> bool:
         """Detect inconsistent timing patterns"""
-        fft_evidence = [e for e in actor.evidence_trail 
-                       if 'FFTDetector' in e.get('source', '')]
-        
-        if not fft_evidence:
+        if not self._has_source(sources, 'FFTDetector'):
             return False
         
         # Check if FFT found no rhythmic patterns but other detectors flagged as bot
-        has_no_rhythm = any('no rhythmic' in e.get('description', '').lower() 
-                           for e in fft_evidence)
+        has_no_rhythm = any('no rhythmic' in description
+                            for description in self._descriptions(actor, 'FFTDetector'))
         has_bot_tags = 'BOT_ACTIVITY' in actor.tags
         
         return has_no_rhythm and has_bot_tags
@@ -212,11 +216,12 @@ class MetaDetector(BaseDetector):
             actor.tags.add(confirmation['type'])
             
             # Boost confidence of related evidence
-            for evidence in actor.evidence_trail:
-                if any(source in evidence.get('source', '') 
+            trail = actor.evidence_trail
+            for i, evidence_source in enumerate(trail.sources):
+                if any(source in evidence_source 
                       for source in confirmation['sources']):
-                    evidence['confidence'] = min(1.0, 
-                                              evidence.get('confidence', 0.0) + self.confidence_boost)
+                    trail.set_confidence(i, min(1.0, 
+                                                trail.confidences[i] + self.confidence_boost))
     
     def _apply_contradictions(self, actor: ActorProfile, contradictions: List[Dict]):
         """Apply contradictory evidence to actor"""
@@ -226,11 +231,12 @@ class MetaDetector(BaseDetector):
             
             # Reduce confidence of conflicting evidence
             penalty = contradiction.get('penalty', self.confidence_penalty)
-            for evidence in actor.evidence_trail:
-                if any(source in evidence.get('source', '') 
+            trail = actor.evidence_trail
+            for i, evidence_source in enumerate(trail.sources):
+                if any(source in evidence_source 
                       for source in contradiction['sources']):
-                    evidence['confidence'] = max(0.0, 
-                                              evidence.get('confidence', 0.0) - penalty)
+                    trail.set_confidence(i, max(0.0, 
+                                                trail.confidences[i] - penalty))
     
     def _add_meta_evidence(self, actor: ActorProfile, confirmations: List[Dict], 
                           contradictions: List[Dict]):
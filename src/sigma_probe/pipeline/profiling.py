@@ -5,14 +5,33 @@
 
 from datetime import datetime
 from typing import Dict, List, Any
-from collections import defaultdict
+from collections import Counter, defaultdict
+from ipaddress import IPv4Address
+
+import numpy as np
+
 from sigma_probe.models.core import LogEvent, ActorProfile, PipelineContext
 from sigma_probe.pipeline.base import PipelineStage
+from sigma_probe.pipeline._enrichment_kernels import _agg
+from sigma_probe.pipeline._jit import NUMBA_AVAILABLE
+
+
+def _ip_to_int(ip) -> int:
+    """Целочисленное представление IPv4 адреса (IPv4Address или строка)"""
+    return int(ip) if isinstance(ip, IPv4Address) else int(IPv4Address(ip))
 
 
 class ActorProfilingStage(PipelineStage):
     """Агрегирует события по IP-адресам и создает профили акторов"""
     
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # На больших потоках группировка идет через сортировку NumPy
+        # вместо поэлементного заполнения словаря
+        self.vectorized_grouping_min_events = int(
+            config.get('vectorized_grouping_min_events', 100000)
+        )
+    
     def process(self, context: PipelineContext) -> PipelineContext:
         """Создает профили акторов из событий"""
         events = context.get('events', [])
@@ -23,20 +42,51 @@ class ActorProfilingStage(PipelineStage):
             return context
         
         # Группировка событий по IP
-        ip_events = defaultdict(list)
-        for event in events:
-            ip_events[str(event.source_ip)].append(event)
+        ip_events = None
+        if len(events) >= self.vectorized_grouping_min_events:
+            try:
+                ip_events = self._group_events_vectorized(events)
+            except ValueError:
+                # Адрес не IPv4 (например, IPv6) и не помещается в uint32-колонку
+                ip_events = None
+        if ip_events is None:
+            # Ключ — сам адрес (IPv4Address хешируется по int), строка
+            # формируется один раз на актора, а не на каждое событие
+            ip_events = defaultdict(list)
+            for event in events:
+                ip_events[event.source_ip].append(event)
         
         # Создание профилей акторов
-        actors = {}
-        for ip_str, ip_events_list in ip_events.items():
-            actor = self._create_actor_profile(ip_events_list)
-            actors[ip_str] = actor
+        actors = {
+            str(ip): self._create_actor_profile(ip_events_list)
+            for ip, ip_events_list in ip_events.items()
+        }
         
         print(f"Создано {len(actors)} профилей акторов")
         context['actors'] = actors
         return context
     
+    @staticmethod
+    def _group_events_vectorized(events: List[LogEvent]) -> Dict[str, List[LogEvent]]:
+        """Группирует события по IP через argsort по uint32-колонке адресов.
+        
+        Сортировка стабильная, поэтому порядок событий внутри актора и порядок
+        самих акторов (по первому появлению) совпадают со словарной группировкой.
+        Для адреса, не являющегося IPv4, выбрасывает ValueError.
+        """
+        source_ips = np.fromiter((_ip_to_int(event.source_ip) for event in events),
+                                 dtype=np.uint32, count=len(events))
+        order = np.argsort(source_ips, kind='stable')
+        unique_ips, starts, counts = np.unique(source_ips[order],
+                                               return_index=True, return_counts=True)
+        
+        ip_events = {}
+        for group in np.argsort(order[starts], kind='stable').tolist():
+            start = int(starts[group])
+            indices = order[start:start + int(counts[group])].tolist()
+            ip_events[str(IPv4Address(int(unique_ips[group])))] = [events[i] for i in indices]
+        return ip_events
+    
     def _create_actor_profile(self, events: List[LogEvent]) -> ActorProfile:
         """Создает профиль актора из списка событий"""
         if not events:
@@ -66,6 +116,12 @@ class ActorProfilingStage(PipelineStage):
 class ActorEnrichmentStage(PipelineStage):
     """Дополнительное обогащение профилей акторов"""
     
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        # Начиная с этого числа событий агрегация идет через JIT-ядро
+        # (только если установлен Numba — иначе ядро медленнее цикла)
+        self.jit_min_events = int(config.get('jit_min_events', 5000))
+    
     def process(self, context: PipelineContext) -> PipelineContext:
         """Обогащает профили акторов дополнительной информацией"""
         actors = context.get('actors', {})
@@ -83,26 +139,21 @@ class ActorEnrichmentStage(PipelineStage):
         if not events:
             return
         
-        # Статистика по HTTP методам
-        methods = [event.http_method for event in events]
-        method_counts = {}
-        for method in methods:
-            method_counts[method] = method_counts.get(method, 0) + 1
-        
-        # Статистика по статус кодам
-        status_codes = [event.status_code for event in events]
-        status_counts = {}
-        for status in status_codes:
-            status_counts[status] = status_counts.get(status, 0) + 1
+        if NUMBA_AVAILABLE and len(events) >= self.jit_min_events:
+            method_counts, status_counts, time_span = self._aggregate_columnar(events)
+        else:
+            # Статистика по HTTP методам и статус кодам
+            method_counts = dict(Counter(event.http_method for event in events))
+            status_counts = dict(Counter(event.status_code for event in events))
+            
+            # Временные характеристики
+            timestamps = [event.timestamp for event in events]
+            time_span = (max(timestamps) - min(timestamps)).total_seconds()
         
         # Статистика по URL
         urls = [event.url_normalized for event in events]
         unique_urls = len(set(urls))
         
-        # Временные характеристики
-        timestamps = [event.timestamp for event in events]
-        time_span = (max(timestamps) - min(timestamps)).total_seconds()
-        
         # Добавление в behavioral_signatures
         actor.behavioral_signatures.update({
             'method_distribution': method_counts,
@@ -118,4 +169,24 @@ class ActorEnrichmentStage(PipelineStage):
         user_agents = [event.user_agent for event in events]
         unique_agents = len(set(user_agents))
         actor.behavioral_signatures['unique_user_agents'] = unique_agents
-        actor.behavioral_signatures['user_agent_diversity'] = unique_agents / max(len(user_agents), 1)
\ No newline at end of file
+        actor.behavioral_signatures['user_agent_diversity'] = unique_agents / max(len(user_agents), 1)
+
+    @staticmethod
+    def _aggregate_columnar(events: List[LogEvent]):
+        """Агрегирует методы, статус коды и временной диапазон одним проходом ядра _agg"""
+        count = len(events)
+        timestamps = np.fromiter((event.timestamp.timestamp() for event in events),
+                                 dtype=np.float64, count=count)
+        status_codes = np.fromiter((event.status_code for event in events),
+                                   dtype=np.int64, count=count)
+        methods, method_ids = np.unique(np.array([event.http_method for event in events]),
+                                        return_inverse=True)
+        
+        method_hist, status_hist, tmin, tmax = _agg(
+            timestamps, status_codes, method_ids,
+            int(status_codes.max()) + 1, len(methods)
+        )
+        
+        method_counts = {str(methods[i]): int(c) for i, c in enumerate(method_hist) if c}
+        status_counts = {int(s): int(status_hist[s]) for s in np.flatnonzero(status_hist)}
+        return method_counts, status_counts, float(tmax - tmin)
@@ -7,7 +7,10 @@ SIGMA-PROBE Narrative Engine
 """
 
 import logging
-from typing import Dict, List, Any, Optional
+import sys
+from collections import Counter
+from operator import attrgetter
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -15,16 +18,230 @@ from ..models.core import ActorProfile, ThreatCampaign
 
 logger = logging.getLogger(__name__)
 
+# Приоритеты, категории и ID техник MITRE повторяются в каждой рекомендации:
+# все экземпляры ссылаются на одни и те же интернированные строки
+_HIGH, _MEDIUM, _LOW = map(sys.intern, ("HIGH", "MEDIUM", "LOW"))
+_IMMEDIATE_ACTION, _INVESTIGATION, _MONITORING = map(
+    sys.intern, ("IMMEDIATE_ACTION", "INVESTIGATION", "MONITORING")
+)
+_T1083, _T1190, _T1595, _T1071_001 = map(sys.intern, ("T1083", "T1190", "T1595", "T1071.001"))
+
+# Числовой приоритет для сортировки (неизвестный приоритет -> 0)
+_PRIO = {_HIGH: 3, _MEDIUM: 2, _LOW: 1}
+
+# Числовой код категории для сводки (неизвестная категория -> -1)
+_CAT_CODE = {_IMMEDIATE_ACTION: 0, _INVESTIGATION: 1, _MONITORING: 2}
+
+# Неизменяемые пункты действий и техники MITRE: одни и те же кортежи
+# разделяются всеми рекомендациями соответствующего типа
+_BOTNET_SQLI_ACTIONS = (
+    "Провести аудит всех SQL-запросов за последние 24 часа",
+    "Проверить права доступа к базе данных",
+)
+_SOPHISTICATED_LFI_ACTIONS = (
+    "Провести аудит прав доступа для веб-сервера",
+    "Проверить все скрипты, работающие с инклудами (include, require)",
+    "Обновить WAF правила для блокировки path traversal",
+    "Проверить логи на предмет успешных попыток доступа к системным файлам",
+)
+_COORDINATED_BOT_ACTIONS = (
+    "Анализировать связи с другими подозрительными IP",
+    "Проверить, не является ли частью DDoS атаки",
+    "Обновить правила IDS/IPS для подобных паттернов",
+)
+_ISOLATED_INDICATOR_ACTIONS = (
+    "Настроить алерты при повторной активности",
+    "Провести базовую проверку репутации IP",
+)
+_COORDINATED_LFI_CAMPAIGN_ACTIONS = (
+    "Провести аудит прав доступа для веб-сервера",
+    "Проверить все скрипты, работающие с инклудами (include, require)",
+    "Обновить WAF правила для блокировки path traversal",
+    "Проверить логи на предмет успешных попыток доступа",
+    "Рассмотреть возможность обновления веб-приложений",
+)
+_BOTNET_CAMPAIGN_ACTIONS = (
+    "Блокировать все IP из кампании на уровне сети",
+    "Провести анализ трафика для выявления C&C серверов",
+    "Обновить правила IDS/IPS",
+    "Проверить все системы на предмет компрометации",
+    "Рассмотреть возможность привлечения IR команды",
+)
+_HIGH_THREAT_VOLUME_ACTIONS = (
+    "Провести полный аудит безопасности инфраструктуры",
+    "Обновить все системы безопасности",
+    "Рассмотреть возможность привлечения IR команды",
+    "Проверить все точки входа в систему",
+)
+_MULTIPLE_BOTNETS_ACTIONS = (
+    "Провести анализ сетевого трафика",
+    "Проверить все системы на малвары",
+    "Обновить антивирусные решения",
+    "Проверить логи DNS на подозрительную активность",
+)
+
+_BOTNET_SQLI_MITRE = (_T1190, _T1071_001)
+_SOPHISTICATED_LFI_MITRE = (_T1083, _T1190)
+_COORDINATED_BOT_MITRE = (_T1071_001, _T1595)
+_ISOLATED_INDICATOR_MITRE = (_T1595,)
+_COORDINATED_LFI_CAMPAIGN_MITRE = (_T1083, _T1190, _T1071_001)
+_BOTNET_CAMPAIGN_MITRE = (_T1071_001, _T1190, _T1595)
+_HIGH_THREAT_VOLUME_MITRE = (_T1190, _T1595)
+_MULTIPLE_BOTNETS_MITRE = (_T1071_001, _T1595)
+
+# Шаблоны текстов рекомендаций: разбираются один раз и заполняются через
+# str.format_map вместо сборки f-строк из фрагментов на каждую рекомендацию
+_TEMPLATES = {
+    'botnet_sqli_title': "Botnet SQL Injection Attack - {ip}",
+    'botnet_sqli_desc': "Актор {ip} с высокой долей уверенности является частью ботнета, "
+                        "проводящего автоматизированные SQL-инъекции. "
+                        "Активность: {first_seen} - {last_seen}",
+    'botnet_sqli_block': "Немедленно заблокировать IP {ip} на файрволе (уровень 7)",
+    'botnet_sqli_db_logs': "Проверить логи базы данных на предмет успешных запросов за период "
+                           "с {first_seen} по {last_seen}",
+    'sophisticated_lfi_title': "Sophisticated LFI Attack - {ip}",
+    'sophisticated_lfi_desc': "Обнаружена изощренная LFI-атака от {ip}. "
+                              "Актор демонстрирует адаптивное поведение и попытки обхода защиты.",
+    'sophisticated_lfi_block': "Блокировать IP {ip} на уровне веб-сервера",
+    'coordinated_bot_title': "Coordinated Bot Activity - {ip}",
+    'coordinated_bot_desc': "Актор {ip} участвует в координированной атаке. "
+                            "Обнаружены паттерны взаимодействия с другими акторами.",
+    'coordinated_bot_monitor': "Мониторить активность IP {ip}",
+    'isolated_indicator_title': "Isolated Threat Indicator - {ip}",
+    'isolated_indicator_desc': "Обнаружен единичный индикатор угрозы от {ip}. "
+                               "Требуется дополнительный мониторинг.",
+    'isolated_indicator_watch': "Добавить IP {ip} в список для мониторинга",
+    'coordinated_lfi_campaign_title': "Coordinated LFI Campaign - {campaign_id}",
+    'coordinated_lfi_campaign_desc': "Обнаружена скоординированная атака типа LFI с участием "
+                                     "{actor_count} акторов. Это указывает на целенаправленную "
+                                     "попытку получить доступ к файловой системе.",
+    'botnet_campaign_title': "Multi-Vector Botnet Campaign - {campaign_id}",
+    'botnet_campaign_desc': "Обнаружена кампания ботнета с множественными векторами атак. "
+                            "Участвует {actor_count} акторов.",
+    'high_threat_volume_desc': "Обнаружено {count} высокоугрожающих акторов. "
+                               "Это указывает на возможную целенаправленную атаку.",
+    'multiple_botnets_desc': "Обнаружено {count} подтвержденных ботнетов. "
+                             "Возможно, инфраструктура находится под атакой.",
+}
+
 @dataclass
 class Recommendation:
     """Структура рекомендации"""
+    # Без __dict__ на экземпляр; dataclass(slots=True) требует Python 3.10
+    __slots__ = (
+        'priority', 'category', 'title', 'description',
+        'action_items', 'mitre_techniques', 'confidence', 'priority_rank',
+    )
+    
     priority: str  # HIGH, MEDIUM, LOW
     category: str  # IMMEDIATE_ACTION, INVESTIGATION, MONITORING
     title: str
     description: str
-    action_items: List[str]
-    mitre_techniques: List[str]
+    action_items: Tuple[str, ...]
+    mitre_techniques: Tuple[str, ...]
     confidence: float
+    
+    def __post_init__(self):
+        # Числовой приоритет для сортировки; обычный слот, а не поле
+        # dataclass, поэтому не участвует в __init__, __eq__ и __repr__
+        self.priority_rank: int = _PRIO.get(self.priority, 0)
+
+
+def _actor_fields(actor: ActorProfile) -> Dict[str, Any]:
+    """Поля актора для подстановки в _TEMPLATES"""
+    first_seen = getattr(actor, 'first_seen', None)
+    last_seen = getattr(actor, 'last_seen', None)
+    if first_seen is None or last_seen is None:
+        # ActorProfile не хранит временные рамки — берем их из событий
+        timestamps = [event.timestamp for event in getattr(actor, 'events', None) or ()]
+        if timestamps:
+            first_seen, last_seen = min(timestamps), max(timestamps)
+    
+    return {
+        'ip': getattr(actor, 'ip', None) or actor.ip_address,
+        'first_seen': first_seen,
+        'last_seen': last_seen,
+    }
+
+
+def _make_botnet_sqli(actor: ActorProfile) -> Recommendation:
+    """Рекомендация: ботнет с SQL-инъекциями"""
+    fields = _actor_fields(actor)
+    return Recommendation(
+        priority=_HIGH,
+        category=_IMMEDIATE_ACTION,
+        title=_TEMPLATES['botnet_sqli_title'].format_map(fields),
+        description=_TEMPLATES['botnet_sqli_desc'].format_map(fields),
+        action_items=(
+            _TEMPLATES['botnet_sqli_block'].format_map(fields),
+            _TEMPLATES['botnet_sqli_db_logs'].format_map(fields),
+            *_BOTNET_SQLI_ACTIONS,
+        ),
+        mitre_techniques=_BOTNET_SQLI_MITRE,
+        confidence=0.95
+    )
+
+
+def _make_sophisticated_lfi(actor: ActorProfile) -> Recommendation:
+    """Рекомендация: изощренная LFI-атака"""
+    fields = _actor_fields(actor)
+    return Recommendation(
+        priority=_HIGH,
+        category=_IMMEDIATE_ACTION,
+        title=_TEMPLATES['sophisticated_lfi_title'].format_map(fields),
+        description=_TEMPLATES['sophisticated_lfi_desc'].format_map(fields),
+        action_items=(
+            _TEMPLATES['sophisticated_lfi_block'].format_map(fields),
+            *_SOPHISTICATED_LFI_ACTIONS,
+        ),
+        mitre_techniques=_SOPHISTICATED_LFI_MITRE,
+        confidence=0.9
+    )
+
+
+def _make_coordinated_bot(actor: ActorProfile) -> Recommendation:
+    """Рекомендация: координированная бот-активность"""
+    fields = _actor_fields(actor)
+    return Recommendation(
+        priority=_MEDIUM,
+        category=_INVESTIGATION,
+        title=_TEMPLATES['coordinated_bot_title'].format_map(fields),
+        description=_TEMPLATES['coordinated_bot_desc'].format_map(fields),
+        action_items=(
+            _TEMPLATES['coordinated_bot_monitor'].format_map(fields),
+            *_COORDINATED_BOT_ACTIONS,
+        ),
+        mitre_techniques=_COORDINATED_BOT_MITRE,
+        confidence=0.8
+    )
+
+
+def _make_isolated_indicator(actor: ActorProfile) -> Recommendation:
+    """Рекомендация: изолированный индикатор угрозы"""
+    fields = _actor_fields(actor)
+    return Recommendation(
+        priority=_LOW,
+        category=_MONITORING,
+        title=_TEMPLATES['isolated_indicator_title'].format_map(fields),
+        description=_TEMPLATES['isolated_indicator_desc'].format_map(fields),
+        action_items=(
+            _TEMPLATES['isolated_indicator_watch'].format_map(fields),
+            *_ISOLATED_INDICATOR_ACTIONS,
+        ),
+        mitre_techniques=_ISOLATED_INDICATOR_MITRE,
+        confidence=0.6
+    )
+
+
+# Правила для отдельного актора: (обязательные теги, фабрика рекомендации).
+# Проверяются по порядку, срабатывает первое подходящее.
+_ACTOR_RULES = (
+    (frozenset({'CONFIRMED_BOTNET', 'SQLI_ATTACK'}), _make_botnet_sqli),
+    (frozenset({'LFI_ATTACK', 'CONFIRMED_SOPHISTICATED'}), _make_sophisticated_lfi),
+    (frozenset({'CONFIRMED_COORDINATED', 'BOT_ACTIVITY'}), _make_coordinated_bot),
+    (frozenset({'ISOLATED_INDICATOR'}), _make_isolated_indicator),
+)
+
 
 class NarrativeEngine:
     """Движок генерации рекомендаций и повествования"""
@@ -32,6 +249,20 @@ class NarrativeEngine:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.recommendations = []
+    
+    @property
+    def recommendations(self) -> Tuple[Recommendation, ...]:
+        return self._recommendations
+    
+    @recommendations.setter
+    def recommendations(self, recommendations: List[Recommendation]) -> None:
+        # Параллельные столбцы кодов приоритета и категории для сводки.
+        # Рекомендации хранятся кортежем: менять их можно только заменой
+        # целиком, поэтому столбцы не расходятся с ними
+        recommendations = tuple(recommendations)
+        self._recommendations = recommendations
+        self._priorities = [r.priority_rank for r in recommendations]
+        self._categories = [_CAT_CODE.get(r.category, -1) for r in recommendations]
         
     def generate_recommendations(self, actors: List[ActorProfile], 
                                campaigns: List[ThreatCampaign]) -> List[Recommendation]:
@@ -55,7 +286,7 @@ class NarrativeEngine:
         recommendations.extend(global_recs)
         
         # Сортировка по приоритету
-        recommendations.sort(key=lambda x: self._priority_score(x.priority), reverse=True)
+        recommendations.sort(key=attrgetter('priority_rank'), reverse=True)
         
         self.recommendations = recommendations
         logger.info(f"Generated {len(recommendations)} recommendations")
@@ -64,124 +295,39 @@ class NarrativeEngine:
     
     def _analyze_actor(self, actor: ActorProfile) -> List[Recommendation]:
         """Анализирует отдельного актора и генерирует рекомендации"""
-        recommendations = []
+        tags = actor.tags
+        for required_tags, make_recommendation in _ACTOR_RULES:
+            if required_tags.issubset(tags):
+                return [make_recommendation(actor)]
         
-        # Ботнет с SQL-инъекциями
-        if {'CONFIRMED_BOTNET', 'SQLI_ATTACK'}.issubset(actor.tags):
-            recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
-                title=f"Botnet SQL Injection Attack - {actor.ip}",
-                description=f"Актор {actor.ip} с высокой долей уверенности является частью ботнета, "
-                          f"проводящего автоматизированные SQL-инъекции. "
-                          f"Активность: {actor.first_seen} - {actor.last_seen}",
-                action_items=[
-                    f"Немедленно заблокировать IP {actor.ip} на файрволе (уровень 7)",
-                    f"Проверить логи базы данных на предмет успешных запросов за период "
-                    f"с {actor.first_seen} по {actor.last_seen}",
-                    "Провести аудит всех SQL-запросов за последние 24 часа",
-                    "Проверить права доступа к базе данных"
-                ],
-                mitre_techniques=["T1190", "T1071.001"],
-                confidence=0.95
-            ))
-        
-        # LFI/RFI атаки
-        elif {'LFI_ATTACK', 'CONFIRMED_SOPHISTICATED'}.issubset(actor.tags):
-            recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
-                title=f"Sophisticated LFI Attack - {actor.ip}",
-                description=f"Обнаружена изощренная LFI-атака от {actor.ip}. "
-                          f"Актор демонстрирует адаптивное поведение и попытки обхода защиты.",
-                action_items=[
-                    f"Блокировать IP {actor.ip} на уровне веб-сервера",
-                    "Провести аудит прав доступа для веб-сервера",
-                    "Проверить все скрипты, работающие с инклудами (include, require)",
-                    "Обновить WAF правила для блокировки path traversal",
-                    "Проверить логи на предмет успешных попыток доступа к системным файлам"
-                ],
-                mitre_techniques=["T1083", "T1190"],
-                confidence=0.9
-            ))
-        
-        # Координированные атаки
-        elif {'CONFIRMED_COORDINATED', 'BOT_ACTIVITY'}.issubset(actor.tags):
-            recommendations.append(Recommendation(
-                priority="MEDIUM",
-                category="INVESTIGATION",
-                title=f"Coordinated Bot Activity - {actor.ip}",
-                description=f"Актор {actor.ip} участвует в координированной атаке. "
-                          f"Обнаружены паттерны взаимодействия с другими акторами.",
-                action_items=[
-                    f"Мониторить активность IP {actor.ip}",
-                    "Анализировать связи с другими подозрительными IP",
-                    "Проверить, не является ли частью DDoS атаки",
-                    "Обновить правила IDS/IPS для подобных паттернов"
-                ],
-                mitre_techniques=["T1071.001", "T1595"],
-                confidence=0.8
-            ))
-        
-        # Изолированные индикаторы
-        elif 'ISOLATED_INDICATOR' in actor.tags:
-            recommendations.append(Recommendation(
-                priority="LOW",
-                category="MONITORING",
-                title=f"Isolated Threat Indicator - {actor.ip}",
-                description=f"Обнаружен единичный индикатор угрозы от {actor.ip}. "
-                          f"Требуется дополнительный мониторинг.",
-                action_items=[
-                    f"Добавить IP {actor.ip} в список для мониторинга",
-                    "Настроить алерты при повторной активности",
-                    "Провести базовую проверку репутации IP"
-                ],
-                mitre_techniques=["T1595"],
-                confidence=0.6
-            ))
-        
-        return recommendations
+        return []
     
     def _analyze_campaign(self, campaign: ThreatCampaign) -> List[Recommendation]:
         """Анализирует кампанию и генерирует рекомендации"""
         recommendations = []
+        fields = {'campaign_id': campaign.campaign_id, 'actor_count': len(campaign.actors)}
         
         # Координированные LFI атаки
         if {'COORDINATED_ATTACK', 'LFI_ATTACK'}.issubset(campaign.primary_tags):
             recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
-                title=f"Coordinated LFI Campaign - {campaign.campaign_id}",
-                description=f"Обнаружена скоординированная атака типа LFI с участием "
-                          f"{len(campaign.actors)} акторов. Это указывает на целенаправленную "
-                          f"попытку получить доступ к файловой системе.",
-                action_items=[
-                    "Провести аудит прав доступа для веб-сервера",
-                    "Проверить все скрипты, работающие с инклудами (include, require)",
-                    "Обновить WAF правила для блокировки path traversal",
-                    "Проверить логи на предмет успешных попыток доступа",
-                    "Рассмотреть возможность обновления веб-приложений"
-                ],
-                mitre_techniques=["T1083", "T1190", "T1071.001"],
+                priority=_HIGH,
+                category=_IMMEDIATE_ACTION,
+                title=_TEMPLATES['coordinated_lfi_campaign_title'].format_map(fields),
+                description=_TEMPLATES['coordinated_lfi_campaign_desc'].format_map(fields),
+                action_items=_COORDINATED_LFI_CAMPAIGN_ACTIONS,
+                mitre_techniques=_COORDINATED_LFI_CAMPAIGN_MITRE,
                 confidence=0.9
             ))
         
         # Ботнет кампании
         elif {'BOTNET_ACTIVITY', 'MULTI_VECTOR'}.issubset(campaign.primary_tags):
             recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
-                title=f"Multi-Vector Botnet Campaign - {campaign.campaign_id}",
-                description=f"Обнаружена кампания ботнета с множественными векторами атак. "
-                          f"Участвует {len(campaign.actors)} акторов.",
-                action_items=[
-                    "Блокировать все IP из кампании на уровне сети",
-                    "Провести анализ трафика для выявления C&C серверов",
-                    "Обновить правила IDS/IPS",
-                    "Проверить все системы на предмет компрометации",
-                    "Рассмотреть возможность привлечения IR команды"
-                ],
-                mitre_techniques=["T1071.001", "T1190", "T1595"],
+                priority=_HIGH,
+                category=_IMMEDIATE_ACTION,
+                title=_TEMPLATES['botnet_campaign_title'].format_map(fields),
+                description=_TEMPLATES['botnet_campaign_desc'].format_map(fields),
+                action_items=_BOTNET_CAMPAIGN_ACTIONS,
+                mitre_techniques=_BOTNET_CAMPAIGN_MITRE,
                 confidence=0.95
             ))
         
@@ -192,67 +338,52 @@ class NarrativeEngine:
         """Генерирует глобальные рекомендации на основе общей картины"""
         recommendations = []
         
-        # Статистика
-        high_threat_actors = [a for a in actors if getattr(a, 'threat_score', 0) > 8.0]
-        confirmed_botnets = [a for a in actors if 'CONFIRMED_BOTNET' in a.tags]
-        coordinated_attacks = [c for c in campaigns if 'COORDINATED_ATTACK' in c.primary_tags]
+        # Статистика (нужны только количества, один проход по акторам)
+        high_threat_actors = 0
+        confirmed_botnets = 0
+        for a in actors:
+            high_threat_actors += (a.threat_score or 0) > 8.0
+            confirmed_botnets += 'CONFIRMED_BOTNET' in a.tags
         
         # Рекомендации по общей картине
-        if len(high_threat_actors) > 5:
+        if high_threat_actors > 5:
             recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
+                priority=_HIGH,
+                category=_IMMEDIATE_ACTION,
                 title="High Volume of Threat Actors Detected",
-                description=f"Обнаружено {len(high_threat_actors)} высокоугрожающих акторов. "
-                          f"Это указывает на возможную целенаправленную атаку.",
-                action_items=[
-                    "Провести полный аудит безопасности инфраструктуры",
-                    "Обновить все системы безопасности",
-                    "Рассмотреть возможность привлечения IR команды",
-                    "Проверить все точки входа в систему"
-                ],
-                mitre_techniques=["T1190", "T1595"],
+                description=_TEMPLATES['high_threat_volume_desc'].format(count=high_threat_actors),
+                action_items=_HIGH_THREAT_VOLUME_ACTIONS,
+                mitre_techniques=_HIGH_THREAT_VOLUME_MITRE,
                 confidence=0.8
             ))
         
-        if len(confirmed_botnets) > 3:
+        if confirmed_botnets > 3:
             recommendations.append(Recommendation(
-                priority="HIGH",
-                category="IMMEDIATE_ACTION",
+                priority=_HIGH,
+                category=_IMMEDIATE_ACTION,
                 title="Multiple Botnet Activities Detected",
-                description=f"Обнаружено {len(confirmed_botnets)} подтвержденных ботнетов. "
-                          f"Возможно, инфраструктура находится под атакой.",
-                action_items=[
-                    "Провести анализ сетевого трафика",
-                    "Проверить все системы на малвары",
-                    "Обновить антивирусные решения",
-                    "Проверить логи DNS на подозрительную активность"
-                ],
-                mitre_techniques=["T1071.001", "T1595"],
+                description=_TEMPLATES['multiple_botnets_desc'].format(count=confirmed_botnets),
+                action_items=_MULTIPLE_BOTNETS_ACTIONS,
+                mitre_techniques=_MULTIPLE_BOTNETS_MITRE,
                 confidence=0.9
             ))
         
         return recommendations
     
-    def _priority_score(self, priority: str) -> int:
-        """Возвращает числовой приоритет для сортировки"""
-        return {"HIGH": 3, "MEDIUM": 2, "LOW": 1}.get(priority, 0)
-    
     def get_recommendations_summary(self) -> Dict[str, Any]:
         """Возвращает сводку рекомендаций"""
         if not self.recommendations:
             return {"message": "No recommendations generated"}
         
-        high_priority = [r for r in self.recommendations if r.priority == "HIGH"]
-        medium_priority = [r for r in self.recommendations if r.priority == "MEDIUM"]
-        low_priority = [r for r in self.recommendations if r.priority == "LOW"]
+        priorities = Counter(self._priorities)
+        categories = Counter(self._categories)
         
         return {
             "total_recommendations": len(self.recommendations),
-            "high_priority": len(high_priority),
-            "medium_priority": len(medium_priority),
-            "low_priority": len(low_priority),
-            "immediate_actions": len([r for r in self.recommendations if r.category == "IMMEDIATE_ACTION"]),
-            "investigations": len([r for r in self.recommendations if r.category == "INVESTIGATION"]),
-            "monitoring": len([r for r in self.recommendations if r.category == "MONITORING"])
+            "high_priority": priorities[_PRIO[_HIGH]],
+            "medium_priority": priorities[_PRIO[_MEDIUM]],
+            "low_priority": priorities[_PRIO[_LOW]],
+            "immediate_actions": categories[_CAT_CODE[_IMMEDIATE_ACTION]],
+            "investigations": categories[_CAT_CODE[_INVESTIGATION]],
+            "monitoring": categories[_CAT_CODE[_MONITORING]]
         } 
\ No newline at end of file
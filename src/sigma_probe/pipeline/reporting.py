@@ -14,8 +14,40 @@ import logging
 
 from ..models.core import ActorProfile, ThreatCampaign
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+
+def _orjson_default(obj: Any) -> Any:
+    """``default`` for orjson: float subclasses (np.float64 scores) stay
+    numbers as with the json module, anything else becomes its str()"""
+    if isinstance(obj, float):
+        return float(obj)
+    return str(obj)
+
+
+def _dumps_report(report_data: Dict[str, Any]) -> str:
+    """Serialize a report as indented JSON; with orjson installed
+    (``sigma-probe[speedups]``) through its C encoder.
+
+    On both paths datetimes and other non-JSON types go through str(),
+    non-string keys are stringified and non-ASCII text is written as is.
+    The documents still differ for values JSON has no spelling for: NaN
+    and infinities become ``NaN``/``Infinity`` with json but ``null`` with
+    orjson, and ints wider than 64 bits raise ``TypeError`` under orjson.
+    """
+    if orjson is None:
+        return json.dumps(report_data, indent=2, default=str, ensure_ascii=False)
+    return orjson.dumps(
+        report_data,
+        default=_orjson_default,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    ).decode()
+
 class ReportingStage:
     """Enhanced reporting stage with evidence trail support"""
     
@@ -344,7 +376,7 @@ class ReportingStage:
                     'anomaly_ratio': actor.anomaly_ratio,
                     'centrality': actor.centrality
                 },
-                'evidence_trail': actor.evidence_trail
+                'evidence_trail': actor.evidence_trail.to_list()
             }
             report_data['actors'].append(actor_data)
         
@@ -360,7 +392,7 @@ class ReportingStage:
             }
             report_data['campaigns'].append(campaign_data)
         
-        return json.dumps(report_data, indent=2, default=str)
+        return _dumps_report(report_data)
     
     def _generate_text_report(self, data: Dict[str, Any]) -> str:
         """Generate text report with evidence trails"""
@@ -6,11 +6,164 @@ SIGMA-PROBE Rules Engine
 """
 
 import logging
-from typing import Dict, List, Any, Set, Tuple
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Any, Sequence, Set, Tuple, Union
+
+import numpy as np
+
 from ..models.core import ActorProfile
+from ._jit import NUMBA_AVAILABLE
+from ._scoring_kernels import _base_score_kernel, _base_score_vectorized, _score_kernel, _score_vectorized
 
 logger = logging.getLogger(__name__)
 
+# Tags consulted by the dynamic combination heuristic
+_ATTACK_TAGS = frozenset({'LFI_RFI', 'SQL_INJECTION', 'XSS', 'COMMAND_INJECTION'})
+_COORD_TAGS = frozenset({'COORDINATOR', 'COORDINATED_ATTACK'})
+_AUTO_TAGS = frozenset({'AUTOMATED_SCAN', 'MANUAL_SCAN'})
+_DYNAMIC_TAGS = _ATTACK_TAGS | _COORD_TAGS | _AUTO_TAGS | {'ANOMALOUS'}
+
+
+def _dynamic_modifier(attack_count: int, coordinated: bool, automated: bool, anomalous: bool) -> float:
+    """Dynamic modifier for one combination of tag interaction flags"""
+    modifier = 1.0
+
+    if attack_count >= 3:
+        modifier *= 2.0  # Multiple attack types
+    elif attack_count == 2:
+        modifier *= 1.5  # Two attack types
+
+    if attack_count > 0:
+        if coordinated:
+            modifier *= 1.8  # Coordinated attacks are more dangerous
+        if automated:
+            modifier *= 1.3  # Systematic attacks
+        if anomalous:
+            modifier *= 1.4  # Anomalous attacks are more concerning
+
+    return modifier
+
+
+# All 4 x 2 x 2 x 2 outcomes, keyed by (min(attack_count, 3), coordinated, automated, anomalous)
+_DYNAMIC_MODIFIERS = {
+    (attack_count, coordinated, automated, anomalous):
+        _dynamic_modifier(attack_count, coordinated, automated, anomalous)
+    for attack_count in range(4)
+    for coordinated in (False, True)
+    for automated in (False, True)
+    for anomalous in (False, True)
+}
+# Same table flattened for the batch path, indexed by ac * 8 + coord * 4 + auto * 2 + anom
+_DYNAMIC_MODIFIER_LUT = np.array([_DYNAMIC_MODIFIERS[key] for key in sorted(_DYNAMIC_MODIFIERS)])
+
+
+# Per-tag modifier conditions: predicate(actor, threshold, view). Plain
+# module-level functions (not lambdas) so that the engine stays picklable
+# for process-based parallel scoring.
+def _condition_fft_is_rhythmic(actor, threshold, view):
+    return view.is_rhythmic
+
+
+def _condition_url_diversity_ratio(actor, threshold, view):
+    return actor.url_diversity_ratio > threshold
+
+
+def _condition_high_entropy(actor, threshold, view):
+    return actor.avg_entropy > threshold
+
+
+def _condition_high_centrality(actor, threshold, view):
+    return actor.centrality > threshold
+
+
+def _condition_anomalous_behavior(actor, threshold, view):
+    return actor.anomaly_ratio > threshold
+
+
+def _condition_coordinated_attack(actor, threshold, view):
+    return view.coordinated_attack
+
+
+def _condition_multiple_attack_types(actor, threshold, view):
+    return len(actor.tags & _ATTACK_TAGS) >= 2
+
+
+def _condition_unknown(actor, threshold, view):
+    return False
+
+
+# Condition name -> (predicate, default threshold)
+_CONDITION_HANDLERS = {
+    'fft_is_rhythmic': (_condition_fft_is_rhythmic, None),
+    'url_diversity_ratio': (_condition_url_diversity_ratio, 0.8),
+    'high_entropy': (_condition_high_entropy, 4.5),
+    'high_centrality': (_condition_high_centrality, 0.5),
+    'anomalous_behavior': (_condition_anomalous_behavior, 0.7),
+    'coordinated_attack': (_condition_coordinated_attack, None),
+    'multiple_attack_types': (_condition_multiple_attack_types, None),
+}
+_UNKNOWN_CONDITION = (_condition_unknown, None)
+
+# Evidence is collected internally as (source_id, type_id, details,
+# confidence) tuples; the ids index the name tables below and
+# inflate_evidence() builds the public dict form on demand.
+Evidence = Tuple[int, int, str, float]
+
+EVIDENCE_SOURCES = ('RulesEngine',)
+EVIDENCE_TYPES = ('modifier_applied', 'combination_detected', 'contextual_modifier', 'global_modifier')
+
+_RULES_ENGINE = 0
+_MODIFIER_APPLIED, _COMBINATION_DETECTED, _CONTEXTUAL_MODIFIER, _GLOBAL_MODIFIER = range(4)
+
+
+def inflate_evidence(evidence: Sequence[Evidence]) -> List[Dict[str, Any]]:
+    """Expand evidence tuples into ``{'source', 'type', 'details', 'confidence'}`` dicts."""
+    return [
+        {
+            'source': EVIDENCE_SOURCES[source_id],
+            'type': EVIDENCE_TYPES[type_id],
+            'details': details,
+            'confidence': confidence,
+        }
+        for source_id, type_id, details, confidence in evidence
+    ]
+
+
+@dataclass(frozen=True)
+class ContextView:
+    """Scalars the scoring rules read from the global context.
+
+    Built once per ``calculate_score`` call or scoring batch so that the
+    per-actor rules use attribute access instead of nested
+    ``context.get(...).get(...)`` chains. A missing summary maps to values
+    that leave the corresponding modifier untouched.
+    """
+    # slots=True requires Python 3.10
+    __slots__ = (
+        'prevalence', 'is_rhythmic', 'has_graph', 'avg_centrality', 'coordinators',
+        'anomaly_rate', 'anomalies', 'largest_cluster', 'total_actors', 'coordinated_attack',
+    )
+
+    prevalence: float
+    is_rhythmic: bool
+    has_graph: bool
+    avg_centrality: float
+    coordinators: int
+    anomaly_rate: float
+    anomalies: int
+    largest_cluster: int
+    total_actors: int
+    coordinated_attack: bool
+
+    def __reduce__(self):
+        # Frozen and slotted: rebuild through __init__ when unpickled in
+        # worker processes (the default slot restore would use setattr)
+        return (ContextView, tuple(getattr(self, name) for name in self.__slots__))
+
+
 class ScoringRulesEngine:
     """Dedicated engine for interpreting and applying scoring rules"""
     
@@ -19,66 +172,425 @@ class ScoringRulesEngine:
         self.scoring_profiles = config.get('scoring_profiles', {})
         self.tag_combinations = config.get('tag_combinations', {})
         self.global_modifiers = config.get('global_modifiers', {})
+
+        # Modifier condition name -> (predicate, default threshold)
+        self._condition_handlers = _CONDITION_HANDLERS
+
+        # Scoring profiles flattened once: tag -> (base score, modifiers), each
+        # modifier being (condition, predicate, threshold, value, evidence text)
+        self._profile_by_tag = {
+            tag: (
+                float(profile.get('base_score', 0.0)),
+                tuple(self._compile_modifier(tag, modifier) for modifier in profile.get('modifiers', [])),
+            )
+            for tag, profile in self.scoring_profiles.items()
+        }
+        # Intersected with actor tags so that unscored tags are never visited
+        self._scored_tags = frozenset(self._profile_by_tag)
+        # The same profiles as flat arrays for the batch base score kernel:
+        # modifiers of profile p are entries modifier_offsets[p]:[p + 1]
+        self._profile_index = {tag: p for p, tag in enumerate(self._profile_by_tag)}
+        self._profile_base = np.array([base for base, _ in self._profile_by_tag.values()], dtype=np.float64)
+        self._modifier_offsets = np.cumsum(
+            [0] + [len(modifiers) for _, modifiers in self._profile_by_tag.values()], dtype=np.intp
+        )
+        self._modifier_values = np.array([
+            float(value) for _, modifiers in self._profile_by_tag.values() for _, _, _, value, _ in modifiers
+        ], dtype=np.float64)
+
+        # 'A+B' combination keys are split once here rather than on every
+        # scored actor: (required tags, multiplier, evidence text).
+        self._compiled_combinations = [
+            (
+                frozenset(combination.split('+')),
+                combo_config.get('multiplier', 1.0),
+                combo_config.get('evidence', f"Detected tag combination: {combination}"),
+            )
+            for combination, combo_config in self.tag_combinations.items()
+        ]
+
+        # Column of every tag the rules can look at, for the batch tag matrix.
+        # With at most 64 such tags, bit j of an actor's uint64 tag mask is
+        # column j and the matrix is unpacked from one mask per actor.
+        vocabulary = set(self._profile_by_tag).union(_DYNAMIC_TAGS, *(
+            combination_tags for combination_tags, _, _ in self._compiled_combinations
+        ))
+        self._tag_column = {tag: j for j, tag in enumerate(sorted(vocabulary))}
+        if len(self._tag_column) <= 64:
+            self._tag_bits = {tag: 1 << j for tag, j in self._tag_column.items()}
+            self._combination_masks = [
+                np.uint64(sum(self._tag_bits[tag] for tag in combination_tags))
+                for combination_tags, _, _ in self._compiled_combinations
+            ]
+        else:
+            self._tag_bits = None
+            self._combination_masks = None
+
+        # LRU cache of calculate_score results keyed by (actor signature,
+        # ContextView); repeated passes over the same actors and context
+        # skip rule evaluation entirely. 0 disables caching.
+        self.score_cache_size = int(config.get('score_cache_size', 4096))
+        self._score_cache: 'OrderedDict[Tuple, Tuple[float, Tuple[Evidence, ...]]]' = OrderedDict()
     
-    def calculate_score(self, actor: ActorProfile, context: Dict[str, Any]) -> Tuple[float, List[Dict[str, Any]]]:
+    def calculate_score(
+        self,
+        actor: ActorProfile,
+        context: Union[Dict[str, Any], ContextView],
+        inflate: bool = True,
+    ) -> Tuple[float, List[Any]]:
         """
         Calculate threat score for an actor based on tags and context
 
+        ``context`` may be the raw context dict or a prebuilt
+        :class:`ContextView` (see :meth:`make_context_view`) when scoring
+        many actors against the same context.
+
+        With ``inflate=False`` the evidence is returned as
+        :data:`Evidence` tuples instead of dicts.
+
         Returns:
             Tuple of (final_score, evidence_list)
         """
-        evidence_list: List[Dict[str, Any]] = []
-        context = context or {}
+        view = context if isinstance(context, ContextView) else self.make_context_view(context)
+
+        if not self.score_cache_size:
+            final_score, evidence = self._calculate_score(actor, view)
+        else:
+            key = (self._actor_signature(actor), view)
+            cached = self._score_cache.get(key)
+            if cached is not None:
+                try:
+                    self._score_cache.move_to_end(key)
+                except KeyError:  # evicted concurrently by another scoring thread
+                    pass
+                final_score, evidence = cached
+            else:
+                final_score, evidence = self._calculate_score(actor, view)
+                self._score_cache[key] = (final_score, tuple(evidence))
+                while len(self._score_cache) > self.score_cache_size:
+                    try:
+                        self._score_cache.popitem(last=False)
+                    except KeyError:
+                        break
+
+        return final_score, inflate_evidence(evidence) if inflate else list(evidence)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Worker processes start with an empty score cache instead of
+        # receiving a pickled copy of it
+        state = self.__dict__.copy()
+        state['_score_cache'] = OrderedDict()
+        return state
+
+    def clear_score_cache(self) -> None:
+        """Drop all memoized calculate_score results."""
+        self._score_cache.clear()
+
+    @staticmethod
+    def _actor_signature(actor: ActorProfile) -> Tuple:
+        """Every actor attribute the scoring rules read.
+
+        Values are used exactly (not rounded): two actors share a cache
+        entry only if every rule sees identical inputs for both.
+        """
+        return (
+            frozenset(actor.tags),
+            actor.url_diversity_ratio,
+            actor.avg_entropy,
+            actor.centrality,
+            actor.anomaly_ratio,
+        )
+
+    def _calculate_score(self, actor: ActorProfile, view: ContextView) -> Tuple[float, List[Evidence]]:
+        """Uncached scoring of one actor against a prebuilt context view."""
+        evidence_list: List[Evidence] = []
 
         # Calculate base score from individual tags. Each tag's score is
         # computed independently and modifiers are applied to that tag's
         # score only, so iteration order is not significant.
-        base_score = self._calculate_base_score(actor, context, evidence_list)
+        base_score = self._calculate_base_score(actor, view, evidence_list)
 
         # Apply tag combination modifiers (explicit combinations + dynamic
         # interactions like "coordination + attack").
         combination_modifier = self._calculate_tag_combination_modifier(actor.tags, evidence_list)
 
         # Apply contextual modifiers driven by the global landscape.
-        contextual_modifier = self._calculate_contextual_modifier(actor, context, evidence_list)
+        contextual_modifier = self._calculate_contextual_modifier(actor, view, evidence_list)
 
         # Apply global modifiers (scale / coordination of the broader attack).
-        global_modifier = self._calculate_global_modifier(context, evidence_list)
+        global_modifier = self._calculate_global_modifier(view, evidence_list)
 
         final_score = base_score * combination_modifier * contextual_modifier * global_modifier
 
         return final_score, evidence_list
 
+    @staticmethod
+    def make_context_view(context: Dict[str, Any]) -> ContextView:
+        """Extract the scalars used by the scoring rules from a context dict."""
+        context = context or {}
+        fft_summary = context.get('fft_summary') or {}
+        graph_summary = context.get('graph_summary') or {}
+        anomaly_summary = context.get('anomaly_summary') or {}
+        clustering_summary = context.get('clustering_summary') or {}
+
+        total_actors = 0
+        for summary in (fft_summary, graph_summary, anomaly_summary, clustering_summary):
+            if summary:
+                total_actors = max(total_actors, summary.get('total_actors', 0))
+
+        return ContextView(
+            prevalence=fft_summary.get('prevalence', 0.0),
+            is_rhythmic=bool(fft_summary.get('is_rhythmic')),
+            has_graph=bool(graph_summary),
+            avg_centrality=graph_summary.get('avg_centrality', 0.0),
+            coordinators=graph_summary.get('coordinators', 0),
+            anomaly_rate=anomaly_summary.get('anomaly_rate', 0.0),
+            anomalies=anomaly_summary.get('anomalies', 0),
+            largest_cluster=clustering_summary.get('largest_cluster', 0),
+            total_actors=total_actors,
+            coordinated_attack=bool(context.get('coordinated_attack', False)),
+        )
+
+    def calculate_scores_batch(
+        self,
+        actors: Sequence[ActorProfile],
+        context: Union[Dict[str, Any], ContextView],
+        inflate: bool = True,
+    ) -> List[Tuple[float, List[Any]]]:
+        """
+        Vectorized equivalent of calling :meth:`calculate_score` per actor.
+
+        Actor tags are packed into a boolean N x T matrix and the numeric
+        features into column arrays once, so every modifier becomes a mask
+        operation over all actors. Evidence is only built for actors whose
+        masks fired, in the same order ``calculate_score`` produces.
+
+        Returns:
+            List of (final_score, evidence_list) tuples aligned with ``actors``
+        """
+        view = context if isinstance(context, ContextView) else self.make_context_view(context)
+        n = len(actors)
+        if n == 0:
+            return []
+
+        # Tag membership matrix over every tag the rules can look at
+        column = self._tag_column
+        tag_bits = self._tag_bits
+        if tag_bits is not None:
+            tag_masks = np.fromiter(
+                (self._pack_tags(actor.tags, tag_bits) for actor in actors), dtype=np.uint64, count=n
+            )
+            bit_positions = np.arange(len(column), dtype=np.uint64)
+            has_tag = ((tag_masks[:, None] >> bit_positions) & np.uint64(1)).astype(bool)
+        else:
+            rows, cols = [], []
+            for i, actor in enumerate(actors):
+                for tag in actor.tags:
+                    j = column.get(tag)
+                    if j is not None:
+                        rows.append(i)
+                        cols.append(j)
+            has_tag = np.zeros((n, len(column)), dtype=bool)
+            has_tag[rows, cols] = True
+
+        features = {
+            name: np.fromiter((getattr(actor, name) for actor in actors), dtype=np.float64, count=n)
+            for name in ('url_diversity_ratio', 'avg_entropy', 'centrality', 'anomaly_ratio')
+        }
+        attack_count = has_tag[:, [column[tag] for tag in sorted(_ATTACK_TAGS)]].sum(axis=1)
+
+        evidence_lists: List[List[Evidence]] = [[] for _ in range(n)]
+
+        # Base score: per-tag score with its own modifiers, summed over tags.
+        # Modifier conditions become one N x M fired matrix; the arithmetic
+        # runs in the base score kernel.
+        offsets = self._modifier_offsets
+        has_profile = has_tag[:, [column[tag] for tag in self._profile_by_tag]]
+        fired = np.zeros((n, len(self._modifier_values)), dtype=bool)
+        # The same condition often guards modifiers of several tags: each
+        # (condition, threshold) mask is computed once per batch
+        condition_masks: Dict[Tuple, np.ndarray] = {}
+        for p, (_, modifiers) in enumerate(self._profile_by_tag.values()):
+            tag_mask = has_profile[:, p]
+            if not tag_mask.any():
+                continue
+            for k, (condition, _, threshold, _, _) in enumerate(modifiers):
+                condition_mask = condition_masks.get((condition, threshold))
+                if condition_mask is None:
+                    condition_mask = condition_masks[condition, threshold] = self._modifier_condition_mask(
+                        condition, threshold, view, features, attack_count, n
+                    )
+                fired[:, offsets[p] + k] = tag_mask & condition_mask
+
+        base = _base_score_kernel if NUMBA_AVAILABLE else _base_score_vectorized
+        base_score = base(has_profile, self._profile_base, offsets, self._modifier_values, fired)
+
+        for i in np.flatnonzero(fired.any(axis=1)).tolist():
+            # Same tag iteration order as _calculate_base_score
+            for tag in actors[i].tags & self._scored_tags:
+                start = offsets[self._profile_index[tag]]
+                for k, (_, _, _, _, evidence) in enumerate(self._profile_by_tag[tag][1]):
+                    if fired[i, start + k]:
+                        evidence_lists[i].append((_RULES_ENGINE, _MODIFIER_APPLIED, evidence, 0.7))
+
+        # Tag combinations: explicit ones first, dynamic heuristic otherwise
+        combination_modifier = np.ones(n)
+        explicit_matched = np.zeros(n, dtype=bool)
+        for k, (combination_tags, multiplier, evidence) in enumerate(self._compiled_combinations):
+            if tag_bits is not None:
+                combination_mask = self._combination_masks[k]
+                matched = (tag_masks & combination_mask) == combination_mask
+            else:
+                matched = has_tag[:, [column[tag] for tag in combination_tags]].all(axis=1)
+            if not matched.any():
+                continue
+            combination_modifier = np.where(matched, combination_modifier * multiplier, combination_modifier)
+            explicit_matched |= matched
+            for i in np.flatnonzero(matched).tolist():
+                evidence_lists[i].append((_RULES_ENGINE, _COMBINATION_DETECTED, evidence, 0.8))
+
+        coordinated = has_tag[:, [column[tag] for tag in sorted(_COORD_TAGS)]].any(axis=1)
+        automated = has_tag[:, [column[tag] for tag in sorted(_AUTO_TAGS)]].any(axis=1)
+        automated_scan = has_tag[:, column['AUTOMATED_SCAN']]
+        dynamic_index = (np.minimum(attack_count, 3) * 8 + coordinated * 4 + automated * 2
+                         + has_tag[:, column['ANOMALOUS']])
+
+        # Contextual modifiers (mirrors _calculate_contextual_modifier)
+        if view.prevalence > 0.5:
+            details = f"Part of widespread automated attack (prevalence: {view.prevalence:.2f})"
+            for i in np.flatnonzero(automated_scan).tolist():
+                evidence_lists[i].append((_RULES_ENGINE, _CONTEXTUAL_MODIFIER, details, 0.6))
+
+        if view.has_graph and view.avg_centrality > 0:
+            for i in np.flatnonzero(features['centrality'] > view.avg_centrality * 2).tolist():
+                evidence_lists[i].append((
+                    _RULES_ENGINE, _CONTEXTUAL_MODIFIER,
+                    f"High centrality ({actors[i].centrality:.2f}) in coordinated environment",
+                    0.7,
+                ))
+
+        if view.anomaly_rate > 0.3:
+            details = f"Highly anomalous in anomalous environment (rate: {view.anomaly_rate:.2f})"
+            for i in np.flatnonzero(features['anomaly_ratio'] > 0.7).tolist():
+                evidence_lists[i].append((_RULES_ENGINE, _CONTEXTUAL_MODIFIER, details, 0.8))
+
+        if view.largest_cluster >= 5:
+            details = f"Part of large coordinated attack (cluster size: {view.largest_cluster})"
+            for i in np.flatnonzero(coordinated).tolist():
+                evidence_lists[i].append((_RULES_ENGINE, _CONTEXTUAL_MODIFIER, details, 0.8))
+
+        # Global modifier does not depend on the actor: compute it once
+        global_evidence: List[Evidence] = []
+        global_modifier = self._calculate_global_modifier(view, global_evidence)
+        if global_evidence:
+            for evidence_list in evidence_lists:
+                evidence_list.extend(global_evidence)
+
+        score = _score_kernel if NUMBA_AVAILABLE else _score_vectorized
+        final_scores = score(
+            base_score, combination_modifier, explicit_matched, dynamic_index, _DYNAMIC_MODIFIER_LUT,
+            automated_scan, coordinated, features['centrality'], features['anomaly_ratio'],
+            float(view.prevalence), view.has_graph, float(view.avg_centrality), float(view.anomaly_rate),
+            int(view.largest_cluster), float(global_modifier),
+        )
+
+        if inflate:
+            evidence_lists = [inflate_evidence(evidence_list) for evidence_list in evidence_lists]
+        return list(zip(final_scores.tolist(), evidence_lists))
+
+    def calculate_scores_parallel(
+        self,
+        actors: Sequence[ActorProfile],
+        context: Union[Dict[str, Any], ContextView],
+        n_workers: int = None,
+        inflate: bool = True,
+    ) -> List[Tuple[float, List[Any]]]:
+        """
+        :meth:`calculate_scores_batch` over contiguous actor chunks in a thread pool.
+
+        The context view and the compiled rules are only read, so the
+        chunks share them without locking. Threads (not processes) are
+        used because the NumPy mask operations release the GIL and the
+        results need no pickling.
+
+        Returns:
+            List of (final_score, evidence_list) tuples aligned with ``actors``
+        """
+        view = context if isinstance(context, ContextView) else self.make_context_view(context)
+        n_workers = min(n_workers or os.cpu_count() or 1, len(actors))
+        if n_workers <= 1:
+            return self.calculate_scores_batch(actors, view, inflate)
+
+        chunk_size = -(-len(actors) // n_workers)
+        chunks = [actors[start:start + chunk_size] for start in range(0, len(actors), chunk_size)]
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            chunk_results = executor.map(lambda chunk: self.calculate_scores_batch(chunk, view, inflate), chunks)
+
+        return [result for results in chunk_results for result in results]
+
+    @staticmethod
+    def _pack_tags(tags: Set[str], tag_bits: Dict[str, int]) -> int:
+        """OR of the bits of the actor's tags that the rules know about."""
+        mask = 0
+        for tag in tags:
+            mask |= tag_bits.get(tag, 0)
+        return mask
+
+    @staticmethod
+    def _modifier_condition_mask(
+        condition: str,
+        threshold: Any,
+        view: ContextView,
+        features: Dict[str, np.ndarray],
+        attack_count: np.ndarray,
+        n: int,
+    ) -> np.ndarray:
+        """Vectorized :meth:`_evaluate_modifier_condition` over all actors."""
+        if condition == 'fft_is_rhythmic':
+            return np.full(n, view.is_rhythmic)
+
+        if condition == 'url_diversity_ratio':
+            return features['url_diversity_ratio'] > threshold
+
+        if condition == 'high_entropy':
+            return features['avg_entropy'] > threshold
+
+        if condition == 'high_centrality':
+            return features['centrality'] > threshold
+
+        if condition == 'anomalous_behavior':
+            return features['anomaly_ratio'] > threshold
+
+        if condition == 'coordinated_attack':
+            return np.full(n, view.coordinated_attack)
+
+        if condition == 'multiple_attack_types':
+            return attack_count >= 2
+
+        return np.zeros(n, dtype=bool)
+
     def _calculate_base_score(
         self,
         actor: ActorProfile,
-        context: Dict[str, Any],
-        evidence_list: List[Dict[str, Any]],
+        view: ContextView,
+        evidence_list: List[Evidence],
     ) -> float:
         """Sum per-tag base scores with per-tag modifiers."""
-        base_score = 0.0
+        scored_tags = actor.tags & self._scored_tags
+        if not scored_tags:
+            return 0.0
 
-        for tag in actor.tags:
-            if tag not in self.scoring_profiles:
-                continue
+        base_score = 0.0
+        profile_by_tag = self._profile_by_tag
 
-            profile = self.scoring_profiles[tag]
-            tag_score = profile.get('base_score', 0.0)
+        for tag in scored_tags:
+            tag_score, modifiers = profile_by_tag[tag]
 
-            for modifier in profile.get('modifiers', []):
-                if self._evaluate_modifier_condition(actor, modifier, context):
-                    modifier_value = modifier.get('value', 1.0)
+            for _, predicate, threshold, modifier_value, evidence in modifiers:
+                if predicate(actor, threshold, view):
                     tag_score *= modifier_value
 
-                    evidence = modifier.get(
-                        'evidence', f"Applied {tag} modifier: {modifier_value}"
-                    )
-                    evidence_list.append({
-                        'source': 'RulesEngine',
-                        'type': 'modifier_applied',
-                        'details': evidence,
-                        'confidence': 0.7,
-                    })
+                    evidence_list.append((_RULES_ENGINE, _MODIFIER_APPLIED, evidence, 0.7))
 
             base_score += tag_score
 
@@ -88,7 +600,7 @@ class ScoringRulesEngine:
         self,
         actor: ActorProfile,
         modifier: Dict[str, Any],
-        context: Dict[str, Any],
+        view: ContextView,
     ) -> bool:
         """Evaluate whether a single per-tag modifier should fire.
 
@@ -97,37 +609,25 @@ class ScoringRulesEngine:
         attached to its profile (which would otherwise cause modifiers to
         always fire and double-count with combination / contextual logic).
         """
-        condition = modifier.get('if', '')
+        predicate, default_threshold = self._condition_handlers.get(
+            modifier.get('if', ''), _UNKNOWN_CONDITION
+        )
+        return predicate(actor, modifier.get('threshold', default_threshold), view)
 
-        if condition == 'fft_is_rhythmic':
-            return bool(context.get('fft_summary', {}).get('is_rhythmic'))
-
-        if condition == 'url_diversity_ratio':
-            threshold = modifier.get('threshold', 0.8)
-            return actor.url_diversity_ratio > threshold
-
-        if condition == 'high_entropy':
-            threshold = modifier.get('threshold', 4.5)
-            return actor.avg_entropy > threshold
-
-        if condition == 'high_centrality':
-            threshold = modifier.get('threshold', 0.5)
-            return actor.centrality > threshold
-
-        if condition == 'anomalous_behavior':
-            threshold = modifier.get('threshold', 0.7)
-            return actor.anomaly_ratio > threshold
-
-        if condition == 'coordinated_attack':
-            return bool(context.get('coordinated_attack', False))
-
-        if condition == 'multiple_attack_types':
-            attack_tags = {'LFI_RFI', 'SQL_INJECTION', 'XSS', 'COMMAND_INJECTION'}
-            return len(actor.tags.intersection(attack_tags)) >= 2
-
-        return False
+    def _compile_modifier(self, tag: str, modifier: Dict[str, Any]) -> Tuple:
+        """Resolve a modifier config into (condition, predicate, threshold, value, evidence)."""
+        condition = modifier.get('if', '')
+        predicate, default_threshold = self._condition_handlers.get(condition, _UNKNOWN_CONDITION)
+        modifier_value = modifier.get('value', 1.0)
+        return (
+            condition,
+            predicate,
+            modifier.get('threshold', default_threshold),
+            modifier_value,
+            modifier.get('evidence', f"Applied {tag} modifier: {modifier_value}"),
+        )
     
-    def _calculate_tag_combination_modifier(self, tags: Set[str], evidence_list: List[Dict[str, Any]]) -> float:
+    def _calculate_tag_combination_modifier(self, tags: Set[str], evidence_list: List[Evidence]) -> float:
         """Calculate modifier based on tag combinations.
 
         Explicit combinations from configuration take precedence over the
@@ -139,19 +639,12 @@ class ScoringRulesEngine:
         modifier = 1.0
         explicit_matched = False
 
-        for combination, config in self.tag_combinations.items():
-            combination_tags = set(combination.split('+'))
-            if combination_tags.issubset(tags):
-                modifier *= config.get('multiplier', 1.0)
+        for combination_tags, multiplier, evidence in self._compiled_combinations:
+            if combination_tags <= tags:
+                modifier *= multiplier
                 explicit_matched = True
 
-                evidence = config.get('evidence', f"Detected tag combination: {combination}")
-                evidence_list.append({
-                    'source': 'RulesEngine',
-                    'type': 'combination_detected',
-                    'details': evidence,
-                    'confidence': 0.8,
-                })
+                evidence_list.append((_RULES_ENGINE, _COMBINATION_DETECTED, evidence, 0.8))
 
         if not explicit_matched:
             modifier *= self._calculate_dynamic_combination_modifier(tags)
@@ -160,147 +653,109 @@ class ScoringRulesEngine:
     
     def _calculate_dynamic_combination_modifier(self, tags: Set[str]) -> float:
         """Calculate dynamic modifier based on tag interactions"""
-        modifier = 1.0
-        
-        # Attack type combinations
-        attack_tags = {'LFI_RFI', 'SQL_INJECTION', 'XSS', 'COMMAND_INJECTION'}
-        attack_count = len(tags.intersection(attack_tags))
-        
-        if attack_count >= 3:
-            modifier *= 2.0  # Multiple attack types
-        elif attack_count == 2:
-            modifier *= 1.5  # Two attack types
-        
-        # Coordination + attack combinations
-        if ('COORDINATOR' in tags or 'COORDINATED_ATTACK' in tags) and attack_count > 0:
-            modifier *= 1.8  # Coordinated attacks are more dangerous
-        
-        # Automation + attack combinations
-        if ('AUTOMATED_SCAN' in tags or 'MANUAL_SCAN' in tags) and attack_count > 0:
-            modifier *= 1.3  # Systematic attacks
-        
-        # Anomaly + attack combinations
-        if 'ANOMALOUS' in tags and attack_count > 0:
-            modifier *= 1.4  # Anomalous attacks are more concerning
-        
-        return modifier
+        attack_count = len(tags & _ATTACK_TAGS)
+        if not attack_count:
+            return 1.0
+
+        return _DYNAMIC_MODIFIERS[
+            min(attack_count, 3),
+            not tags.isdisjoint(_COORD_TAGS),
+            not tags.isdisjoint(_AUTO_TAGS),
+            'ANOMALOUS' in tags,
+        ]
     
-    def _calculate_contextual_modifier(self, actor: ActorProfile, context: Dict[str, Any], evidence_list: List[Dict[str, Any]]) -> float:
+    def _calculate_contextual_modifier(self, actor: ActorProfile, view: ContextView, evidence_list: List[Evidence]) -> float:
         """Calculate contextual modifier based on global context"""
         modifier = 1.0
         
         # FFT context
-        fft_summary = context.get('fft_summary', {})
-        if fft_summary:
-            prevalence = fft_summary.get('prevalence', 0.0)
-            if prevalence > 0.5:  # More than half are rhythmic
-                if 'AUTOMATED_SCAN' in actor.tags:
-                    modifier *= 1.2  # Part of widespread automated attack
-                    evidence_list.append({
-                        'source': 'RulesEngine',
-                        'type': 'contextual_modifier',
-                        'details': f"Part of widespread automated attack (prevalence: {prevalence:.2f})",
-                        'confidence': 0.6
-                    })
-                else:
-                    modifier *= 0.8  # Stands out as non-automated
+        if view.prevalence > 0.5:  # More than half are rhythmic
+            if 'AUTOMATED_SCAN' in actor.tags:
+                modifier *= 1.2  # Part of widespread automated attack
+                evidence_list.append((
+                    _RULES_ENGINE, _CONTEXTUAL_MODIFIER,
+                    f"Part of widespread automated attack (prevalence: {view.prevalence:.2f})",
+                    0.6,
+                ))
+            else:
+                modifier *= 0.8  # Stands out as non-automated
         
         # Graph context
-        graph_summary = context.get('graph_summary', {})
-        if graph_summary:
-            avg_centrality = graph_summary.get('avg_centrality', 0.0)
+        if view.has_graph:
+            avg_centrality = view.avg_centrality
             if avg_centrality > 0 and actor.centrality > avg_centrality * 2:
                 modifier *= 1.3  # High centrality in coordinated attack
-                evidence_list.append({
-                    'source': 'RulesEngine',
-                    'type': 'contextual_modifier',
-                    'details': f"High centrality ({actor.centrality:.2f}) in coordinated environment",
-                    'confidence': 0.7
-                })
+                evidence_list.append((
+                    _RULES_ENGINE, _CONTEXTUAL_MODIFIER,
+                    f"High centrality ({actor.centrality:.2f}) in coordinated environment",
+                    0.7,
+                ))
             elif actor.centrality < avg_centrality * 0.5:
                 modifier *= 0.9  # Low centrality, less concerning
         
         # Anomaly context
-        anomaly_summary = context.get('anomaly_summary', {})
-        if anomaly_summary:
-            anomaly_rate = anomaly_summary.get('anomaly_rate', 0.0)
-            if anomaly_rate > 0.3:  # High anomaly rate
-                if actor.anomaly_ratio > 0.7:
-                    modifier *= 1.4  # Highly anomalous in anomalous environment
-                    evidence_list.append({
-                        'source': 'RulesEngine',
-                        'type': 'contextual_modifier',
-                        'details': f"Highly anomalous in anomalous environment (rate: {anomaly_rate:.2f})",
-                        'confidence': 0.8
-                    })
-                else:
-                    modifier *= 0.7  # Normal in anomalous environment
+        if view.anomaly_rate > 0.3:  # High anomaly rate
+            if actor.anomaly_ratio > 0.7:
+                modifier *= 1.4  # Highly anomalous in anomalous environment
+                evidence_list.append((
+                    _RULES_ENGINE, _CONTEXTUAL_MODIFIER,
+                    f"Highly anomalous in anomalous environment (rate: {view.anomaly_rate:.2f})",
+                    0.8,
+                ))
+            else:
+                modifier *= 0.7  # Normal in anomalous environment
         
         # Clustering context
-        clustering_summary = context.get('clustering_summary', {})
-        if clustering_summary:
-            largest_cluster = clustering_summary.get('largest_cluster', 0)
-            if largest_cluster >= 5:  # Large coordinated attack
-                if 'COORDINATED_ATTACK' in actor.tags or 'COORDINATOR' in actor.tags:
-                    modifier *= 1.5  # Part of large coordinated attack
-                    evidence_list.append({
-                        'source': 'RulesEngine',
-                        'type': 'contextual_modifier',
-                        'details': f"Part of large coordinated attack (cluster size: {largest_cluster})",
-                        'confidence': 0.8
-                    })
+        if view.largest_cluster >= 5:  # Large coordinated attack
+            if 'COORDINATED_ATTACK' in actor.tags or 'COORDINATOR' in actor.tags:
+                modifier *= 1.5  # Part of large coordinated attack
+                evidence_list.append((
+                    _RULES_ENGINE, _CONTEXTUAL_MODIFIER,
+                    f"Part of large coordinated attack (cluster size: {view.largest_cluster})",
+                    0.8,
+                ))
         
         return modifier
     
-    def _calculate_global_modifier(self, context: Dict[str, Any], evidence_list: List[Dict[str, Any]]) -> float:
+    def _calculate_global_modifier(self, view: ContextView, evidence_list: List[Evidence]) -> float:
         """Calculate global modifier based on overall threat landscape"""
         modifier = 1.0
         
-        # Check for global threat indicators
-        total_actors = 0
-        for summary in [context.get('fft_summary', {}), context.get('graph_summary', {}), 
-                       context.get('anomaly_summary', {}), context.get('clustering_summary', {})]:
-            if summary:
-                total_actors = max(total_actors, summary.get('total_actors', 0))
-        
         # Apply global modifiers based on threat landscape
+        total_actors = view.total_actors
         if total_actors > 100:
             modifier *= 1.2  # Large-scale attack
-            evidence_list.append({
-                'source': 'RulesEngine',
-                'type': 'global_modifier',
-                'details': f"Large-scale attack detected ({total_actors} actors)",
-                'confidence': 0.7
-            })
+            evidence_list.append((
+                _RULES_ENGINE, _GLOBAL_MODIFIER,
+                f"Large-scale attack detected ({total_actors} actors)",
+                0.7,
+            ))
         elif total_actors > 50:
             modifier *= 1.1  # Medium-scale attack
-            evidence_list.append({
-                'source': 'RulesEngine',
-                'type': 'global_modifier',
-                'details': f"Medium-scale attack detected ({total_actors} actors)",
-                'confidence': 0.6
-            })
+            evidence_list.append((
+                _RULES_ENGINE, _GLOBAL_MODIFIER,
+                f"Medium-scale attack detected ({total_actors} actors)",
+                0.6,
+            ))
         
         # Check for coordinated attack indicators
-        coordinators = context.get('graph_summary', {}).get('coordinators', 0)
+        coordinators = view.coordinators
         if coordinators > 5:
             modifier *= 1.3  # Highly coordinated attack
-            evidence_list.append({
-                'source': 'RulesEngine',
-                'type': 'global_modifier',
-                'details': f"Highly coordinated attack ({coordinators} coordinators)",
-                'confidence': 0.8
-            })
+            evidence_list.append((
+                _RULES_ENGINE, _GLOBAL_MODIFIER,
+                f"Highly coordinated attack ({coordinators} coordinators)",
+                0.8,
+            ))
         
         # Check for anomaly indicators
-        anomalies = context.get('anomaly_summary', {}).get('anomalies', 0)
+        anomalies = view.anomalies
         if anomalies > 10:
             modifier *= 1.2  # High anomaly rate
-            evidence_list.append({
-                'source': 'RulesEngine',
-                'type': 'global_modifier',
-                'details': f"High anomaly rate ({anomalies} anomalous actors)",
-                'confidence': 0.7
-            })
+            evidence_list.append((
+                _RULES_ENGINE, _GLOBAL_MODIFIER,
+                f"High anomaly rate ({anomalies} anomalous actors)",
+                0.7,
+            ))
         
         return modifier 
\ No newline at end of file
@@ -6,23 +6,55 @@ SIGMA-PROBE Scoring Engine
 """
 
 import numpy as np
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any, NamedTuple, Set, Tuple
 import logging
 from collections import Counter
+from itertools import chain
 
 from sigma_probe.models.core import ActorProfile, ThreatCampaign
-from .rules_engine import ScoringRulesEngine
-from sklearn.preprocessing import StandardScaler
+from .rules_engine import EVIDENCE_SOURCES, EVIDENCE_TYPES, Evidence, ScoringRulesEngine
+from ._clustering_kernels import BEHAVIORAL_VECTOR_SIZE, _behavioral_matrix
+from ._jit import NUMBA_AVAILABLE
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.sparse import csr_matrix
 from sklearn.cluster import DBSCAN
+from sklearn.neighbors import NearestNeighbors
 
 logger = logging.getLogger(__name__)
 
+
+class _ScoringInput(NamedTuple):
+    """The ActorProfile fields the rules engine reads, shipped to worker processes
+    instead of whole profiles (which carry every event)"""
+    tags: Set[str]
+    url_diversity_ratio: float
+    avg_entropy: float
+    centrality: float
+    anomaly_ratio: float
+
+
 class ScoringEngine:
     """Simplified scoring engine that orchestrates the scoring process"""
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.rules_engine = ScoringRulesEngine(config)
+        # From this many actors score_actors switches to the vectorized path
+        self.batch_min_actors = int(config.get('batch_min_actors', 256))
+        # From this many actors the batch path is split across joblib workers
+        self.parallel_min_actors = int(config.get('parallel_min_actors', 50000))
+        self.n_jobs = config.get('n_jobs', -1)
+        # Up to this many actors the DBSCAN neighborhood graph comes from one
+        # dense GEMM (N x N float32 scratch); above it from NearestNeighbors
+        self.gemm_max_actors = int(config.get('gemm_max_actors', 1024))
+        # Duplicate behavioral vectors are collapsed before DBSCAN when the
+        # unique rows are fewer than this fraction of all rows
+        self.dedupe_max_unique_ratio = float(config.get('dedupe_max_unique_ratio', 0.7))
+        # Above this many (deduplicated) behavioral vectors DBSCAN is
+        # replaced by O(N) grid hashing of the standardized vectors
+        self.max_dbscan_actors = int(config.get('max_dbscan_actors', 10000))
+        # Built on first use and reused by every cluster_campaigns call
+        self._dbscan = None
         
     def score_actors(self, actors: List[ActorProfile], context: Dict[str, Any]) -> List[ActorProfile]:
         """
@@ -35,33 +67,103 @@ class ScoringEngine:
         Returns:
             List of scored ActorProfile objects.
         """
+        if len(actors) >= self.parallel_min_actors:
+            return self.score_actors_parallel(actors, context)
+        if len(actors) >= self.batch_min_actors:
+            return self.score_actors_batch(actors, context)
+        
         logger.info(f"Scoring {len(actors)} actors with rules engine")
         
         for actor in actors:
             # Use rules engine to calculate score
-            final_score, evidence_list = self.rules_engine.calculate_score(actor, context)
-            
-            # Store score in actor
-            actor.threat_score = final_score
+            final_score, evidence_list = self.rules_engine.calculate_score(actor, context, inflate=False)
+            self._apply_score(actor, final_score, evidence_list)
+        
+        return actors
+    
+    def score_actors_batch(self, actors: List[ActorProfile], context: Dict[str, Any]) -> List[ActorProfile]:
+        """
+        Score actors with the vectorized rules engine path.
+        
+        Scores for all actors are computed at once by
+        ``ScoringRulesEngine.calculate_scores_batch``; recording evidence on
+        each actor is the only per-actor step left.
+        
+        Args:
+            actors: List of ActorProfile objects to score.
+            context: Global context dictionary.
             
-            # Add evidence from rules engine
-            for evidence in evidence_list:
-                actor.add_evidence(
-                    evidence['source'],
-                    evidence['type'],
-                    evidence['details'],
-                    evidence.get('confidence', 1.0)
-                )
+        Returns:
+            List of scored ActorProfile objects.
+        """
+        logger.info(f"Batch scoring {len(actors)} actors with rules engine")
+        
+        results = self.rules_engine.calculate_scores_batch(actors, context, inflate=False)
+        for actor, (final_score, evidence_list) in zip(actors, results):
+            self._apply_score(actor, final_score, evidence_list)
+        
+        return actors
+    
+    def score_actors_parallel(self, actors: List[ActorProfile], context: Dict[str, Any]) -> List[ActorProfile]:
+        """
+        Score actors with the vectorized path split across joblib (loky) workers.
+        
+        Workers receive only the scored fields of each actor and return raw
+        evidence tuples; scores and evidence are applied to the profiles
+        here, on the calling thread.
+        
+        Args:
+            actors: List of ActorProfile objects to score.
+            context: Global context dictionary.
             
-            # Add summary evidence
+        Returns:
+            List of scored ActorProfile objects.
+        """
+        n_jobs = min(effective_n_jobs(self.n_jobs), len(actors))
+        if n_jobs <= 1:
+            return self.score_actors_batch(actors, context)
+        
+        logger.info(f"Scoring {len(actors)} actors with rules engine across {n_jobs} workers")
+        
+        view = self.rules_engine.make_context_view(context)
+        inputs = [
+            _ScoringInput(actor.tags, actor.url_diversity_ratio, actor.avg_entropy,
+                          actor.centrality, actor.anomaly_ratio)
+            for actor in actors
+        ]
+        chunk_size = -(-len(inputs) // n_jobs)
+        chunk_results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(self.rules_engine.calculate_scores_batch)(inputs[start:start + chunk_size], view, False)
+            for start in range(0, len(inputs), chunk_size)
+        )
+        
+        results = chain.from_iterable(chunk_results)
+        for actor, (final_score, evidence_list) in zip(actors, results):
+            self._apply_score(actor, final_score, evidence_list)
+        
+        return actors
+    
+    @staticmethod
+    def _apply_score(actor: ActorProfile, final_score: float, evidence_list: List[Evidence]) -> None:
+        """Store the score on the actor and record the rules engine evidence"""
+        actor.threat_score = final_score
+        
+        # Add evidence from rules engine
+        for source_id, type_id, details, confidence in evidence_list:
             actor.add_evidence(
-                "ScoringEngine",
-                "threat_score_calculated",
-                f"Final threat score: {final_score:.2f}",
-                0.9
+                EVIDENCE_SOURCES[source_id],
+                EVIDENCE_TYPES[type_id],
+                details,
+                confidence
             )
         
-        return actors
+        # Add summary evidence (details formatted only if the entry is read)
+        actor.add_evidence(
+            "ScoringEngine",
+            "threat_score_calculated",
+            ("Final threat score: {:.2f}", (final_score,)),
+            0.9
+        )
     
     def cluster_campaigns(self, actors: List[ActorProfile], context: Dict[str, Any]) -> List[ThreatCampaign]:
         """
@@ -80,74 +182,73 @@ class ScoringEngine:
             return []
         
         # Extract behavioral vectors
-        behavioral_vectors = []
-        valid_actors = []
-        
-        for actor in actors:
-            vector = actor.get_behavioral_vector()
-            if vector and sum(vector) > 0:  # Only include actors with meaningful behavior
-                behavioral_vectors.append(vector)
-                valid_actors.append(actor)
+        if NUMBA_AVAILABLE:
+            vectors_array, valid_actors = self._behavioral_vectors_compiled(actors)
+        else:
+            vectors_array, valid_actors = self._behavioral_vectors(actors)
         
-        if len(behavioral_vectors) < 2:
+        if len(valid_actors) < 2:
             return []
         
-        # Normalize vectors
-        vectors_array = np.array(behavioral_vectors)
-        scaler = StandardScaler()
-        normalized_vectors = scaler.fit_transform(vectors_array)
-        
-        # Perform clustering
-        clustering = DBSCAN(eps=0.5, min_samples=2)
-        cluster_labels = clustering.fit_predict(normalized_vectors)
-        
-        # Process clusters
-        clusters = {}
-        for i, (actor, label) in enumerate(zip(valid_actors, cluster_labels)):
-            if label >= 0:  # Valid cluster
-                if label not in clusters:
-                    clusters[label] = []
-                clusters[label].append(actor)
-        
-        # Tag actors based on cluster characteristics
-        for cluster_id, cluster_actors in clusters.items():
-            if len(cluster_actors) >= 3:
+        if not np.ptp(vectors_array, axis=0).any():
+            # All behavioral vectors are identical: every actor is every
+            # other actor's neighbor, which DBSCAN reports as one cluster
+            cluster_labels = np.zeros(len(valid_actors), dtype=np.intp)
+        else:
+            cluster_labels = self._dbscan_labels(vectors_array)
+        
+        # Cluster sizes from one O(N) np.bincount; labels are 0..k-1 with
+        # DBSCAN noise as -1, so bin 0 counts the noise
+        counts = np.bincount(cluster_labels + 1)
+        sizes = counts.tolist()
+        
+        # Tag actors based on cluster characteristics (label -1 is DBSCAN noise)
+        for actor, label in zip(valid_actors, cluster_labels.tolist()):
+            size = sizes[label + 1]
+            if label < 0:
+                # Isolated actor
+                actor.add_tag('ISOLATED_ATTACKER', 'ScoringEngine')
+                actor.add_evidence(
+                    'ScoringEngine',
+                    "isolated_attacker_detected",
+                    "Actor shows unique behavioral pattern",
+                    0.5
+                )
+            elif size >= 3:
                 # Large coordinated cluster
-                for actor in cluster_actors:
-                    actor.add_tag('COORDINATED_ATTACK', 'ScoringEngine')
-                    actor.add_evidence(
-                        'ScoringEngine',
-                        "coordinated_attack_detected",
-                        f"Part of coordinated cluster {cluster_id} with {len(cluster_actors)} actors",
-                        0.8
-                    )
-            elif len(cluster_actors) == 2:
+                actor.add_tag('COORDINATED_ATTACK', 'ScoringEngine')
+                actor.add_evidence(
+                    'ScoringEngine',
+                    "coordinated_attack_detected",
+                    ("Part of coordinated cluster {} with {} actors", (label, size)),
+                    0.8
+                )
+            elif size == 2:
                 # Small coordinated pair
-                for actor in cluster_actors:
-                    actor.add_tag('PAIRED_ATTACK', 'ScoringEngine')
-                    actor.add_evidence(
-                        'ScoringEngine',
-                        "paired_attack_detected",
-                        f"Part of attack pair in cluster {cluster_id}",
-                        0.6
-                    )
-        
-        # Detect isolated actors (noise in DBSCAN)
-        isolated_actors = [actor for actor in valid_actors if actor.ip_address not in 
-                          [a.ip_address for cluster in clusters.values() for a in cluster]]
-        
-        for actor in isolated_actors:
-            actor.add_tag('ISOLATED_ATTACKER', 'ScoringEngine')
-            actor.add_evidence(
-                'ScoringEngine',
-                "isolated_attacker_detected",
-                "Actor shows unique behavioral pattern",
-                0.5
-            )
+                actor.add_tag('PAIRED_ATTACK', 'ScoringEngine')
+                actor.add_evidence(
+                    'ScoringEngine',
+                    "paired_attack_detected",
+                    ("Part of attack pair in cluster {}", (label,)),
+                    0.6
+                )
+        
+        # Group clustered actors in NumPy: noise is dropped first, then a
+        # stable argsort of the labels is split at the cluster boundaries,
+        # so each group lists its members in actor order
+        members = np.flatnonzero(cluster_labels >= 0)
+        order = members[np.argsort(cluster_labels[members], kind='stable')]
+        cluster_sizes = counts[1:]
+        groups = np.split(order, np.cumsum(cluster_sizes)[:-1])
+        clusters = {
+            cluster_id: [valid_actors[i] for i in group.tolist()]
+            for cluster_id, group in enumerate(groups) if len(group)
+        }
         
-        # Create campaign objects
+        # Create campaign objects, in order of each cluster's first member
         campaigns = []
-        for cluster_id, cluster_actors in clusters.items():
+        for cluster_id in sorted(clusters, key=lambda k: groups[k][0]):
+            cluster_actors = clusters[cluster_id]
             campaign = ThreatCampaign(
                 campaign_id=f"campaign_{cluster_id}",
                 actors=cluster_actors
@@ -166,4 +267,139 @@ class ScoringEngine:
             campaigns.append(campaign)
         
         logger.info(f"Created {len(campaigns)} campaigns from {len(actors)} actors")
-        return campaigns
\ No newline at end of file
+        return campaigns
+    
+    def _dbscan_labels(self, vectors_array: np.ndarray) -> np.ndarray:
+        """DBSCAN cluster labels (-1 for noise) of the behavioral matrix"""
+        # Normalize vectors (standard scaling, in place in float32)
+        normalized_vectors = self._standardize(vectors_array)
+        
+        # Identical rows (e.g. a botnet replaying one pattern) are clustered
+        # once, weighted by their multiplicity: a weighted point has the same
+        # neighborhood mass as its copies had, so core points and labels are
+        # unchanged. Unique rows keep first-occurrence order, which keeps
+        # DBSCAN's cluster numbering.
+        sample_weight = inverse = None
+        unique_rows, first_index, unique_inverse, counts = np.unique(
+            normalized_vectors, axis=0, return_index=True, return_inverse=True, return_counts=True
+        )
+        if len(unique_rows) < self.dedupe_max_unique_ratio * len(normalized_vectors):
+            order = np.argsort(first_index)
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            normalized_vectors = unique_rows[order]
+            sample_weight = counts[order]
+            inverse = rank[unique_inverse.reshape(-1)]
+        
+        if len(normalized_vectors) > self.max_dbscan_actors:
+            labels = self._grid_labels(normalized_vectors, 0.5, sample_weight)
+            return labels if inverse is None else labels[inverse]
+        
+        # Perform clustering on a sparse eps-neighborhood graph: memory grows
+        # with the number of neighbor pairs instead of n^2. Self-pairs and
+        # identical vectors are stored as explicit zero distances, which
+        # DBSCAN counts as neighbors.
+        if len(normalized_vectors) <= self.gemm_max_actors:
+            neighborhood_graph = self._radius_graph_gemm(normalized_vectors, 0.5)
+        else:
+            neighbors = NearestNeighbors(radius=0.5, n_jobs=-1).fit(normalized_vectors)
+            neighborhood_graph = neighbors.radius_neighbors_graph(normalized_vectors, mode='distance')
+        if self._dbscan is None:
+            self._dbscan = DBSCAN(eps=0.5, min_samples=2, metric='precomputed', n_jobs=-1)
+        labels = self._dbscan.fit_predict(neighborhood_graph, sample_weight=sample_weight)
+        return labels if inverse is None else labels[inverse]
+    
+    @staticmethod
+    def _behavioral_vectors(actors: List[ActorProfile]) -> Tuple[np.ndarray, List[ActorProfile]]:
+        """Behavioral matrix of actors with meaningful behavior, one get_behavioral_vector call each"""
+        # Vectors are always BEHAVIORAL_VECTOR_SIZE wide, so they are streamed
+        # straight into one float32 buffer without an intermediate list
+        n = len(actors)
+        vectors_array = np.fromiter(
+            chain.from_iterable(actor.get_behavioral_vector() for actor in actors),
+            dtype=np.float32, count=n * BEHAVIORAL_VECTOR_SIZE
+        ).reshape(n, BEHAVIORAL_VECTOR_SIZE)
+        
+        # Only include actors with meaningful behavior (frequencies are
+        # non-negative, so a non-zero sum means a non-zero entry)
+        meaningful = vectors_array.any(axis=1)
+        valid_actors = [actor for actor, keep in zip(actors, meaningful.tolist()) if keep]
+        return vectors_array[meaningful], valid_actors
+    
+    @staticmethod
+    def _behavioral_vectors_compiled(actors: List[ActorProfile]) -> Tuple[np.ndarray, List[ActorProfile]]:
+        """Same as _behavioral_vectors, built by the parallel _behavioral_matrix kernel"""
+        count = len(actors)
+        lengths = np.fromiter((len(actor.url_frequency_vector) for actor in actors),
+                              dtype=np.int64, count=count)
+        offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        frequencies = np.fromiter(
+            chain.from_iterable(actor.url_frequency_vector.values() for actor in actors),
+            dtype=np.float64, count=int(offsets[-1])
+        )
+        
+        vectors_array = np.empty((count, BEHAVIORAL_VECTOR_SIZE), dtype=np.float32)
+        totals = _behavioral_matrix(frequencies, offsets, vectors_array)
+        
+        valid = totals > 0  # Only include actors with meaningful behavior
+        return vectors_array[valid], [actors[i] for i in np.flatnonzero(valid).tolist()]
+    
+    @staticmethod
+    def _grid_labels(vectors: np.ndarray, eps: float, sample_weight: np.ndarray = None) -> np.ndarray:
+        """Campaign labels by spatial grid hashing, the fallback for very large windows.
+        
+        Vectors are bucketed into cells of side ``eps / sqrt(dims)``, so any
+        two vectors sharing a cell are within ``eps`` of each other (DBSCAN
+        neighbors). Cells holding at least two actors (by weight) become
+        clusters, numbered in order of first occurrence; the rest is noise
+        (-1). Neighbors split across cell borders are not merged, so this
+        finds a subset of DBSCAN's cluster links in O(N).
+        """
+        cell_size = eps / np.sqrt(vectors.shape[1])
+        cells = np.floor(vectors / cell_size).astype(np.int64)
+        _, first_index, cell_of_row = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+        cell_of_row = cell_of_row.reshape(-1)
+        weights = np.bincount(cell_of_row, weights=sample_weight)
+        
+        dense = np.argsort(first_index, kind='stable')
+        dense = dense[weights[dense] >= 2]
+        cell_labels = np.full(len(first_index), -1, dtype=np.intp)
+        cell_labels[dense] = np.arange(len(dense))
+        return cell_labels[cell_of_row]
+    
+    @staticmethod
+    def _radius_graph_gemm(vectors: np.ndarray, radius: float) -> csr_matrix:
+        """Sparse distance graph of all pairs within ``radius``, via one GEMM.
+        
+        Squared distances come from the expansion |x|^2 + |y|^2 - 2 x.y, so
+        the O(n^2 d) work is a single BLAS matrix product. Cancellation can
+        push identical pairs slightly below zero; they are clipped to an
+        explicit 0.0 so that DBSCAN still sees them as neighbors.
+        """
+        norms = np.einsum('ij,ij->i', vectors, vectors)
+        squared = vectors @ vectors.T
+        squared *= -2.0
+        squared += norms[:, None]
+        squared += norms[None, :]
+        np.maximum(squared, 0.0, out=squared)
+        np.fill_diagonal(squared, 0.0)
+        
+        rows, cols = np.nonzero(squared <= radius * radius)
+        distances = np.sqrt(squared[rows, cols])
+        return csr_matrix((distances, (rows, cols)), shape=squared.shape)
+    
+    @staticmethod
+    def _standardize(vectors: np.ndarray) -> np.ndarray:
+        """Scale columns to zero mean and unit variance in place.
+        
+        Same result as StandardScaler().fit_transform without its validation
+        and copies. Statistics are accumulated in float64, so a constant
+        column gets exactly zero variance and is left unscaled.
+        """
+        mean = vectors.mean(axis=0, dtype=np.float64)
+        std = vectors.std(axis=0, dtype=np.float64)
+        std[std == 0.0] = 1.0
+        np.subtract(vectors, mean.astype(vectors.dtype), out=vectors)
+        np.divide(vectors, std.astype(vectors.dtype), out=vectors)
+        return vectors
\ No newline at end of file
@@ -2,12 +2,17 @@
 Unit tests for SIGMA-PROBE Detectors
 """
 
+import math
+
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
 from sigma_probe.models.core import ActorProfile, LogEvent
+from sigma_probe.pipeline._detector_kernels import _interval_cv
 from sigma_probe.pipeline.detectors import FFTDetector, GraphDetector, AnomalyDetector
+from sigma_probe.pipeline.metadetector import MetaDetector
 
 class TestFFTDetector:
     """Test cases for FFTDetector"""
@@ -102,6 +107,23 @@ class TestFFTDetector:
         # Should not add any tags due to insufficient events
         assert len(actor.tags) == 0
         assert 'fft_summary' in context_update
+    
+    @pytest.mark.parametrize("timestamps", [
+        [0.0, 60.0, 120.5, 180.0, 241.0, 300.0],
+        [5.0, 6.0, 30.0, 31.0, 90.0],
+        [1.7e9, 1.7e9 + 0.25, 1.7e9 + 0.5, 1.7e9 + 0.8],
+    ])
+    def test_interval_cv_kernel_matches_numpy(self, timestamps):
+        """Test the fused interval CV kernel against the NumPy path"""
+        timestamps = np.asarray(timestamps)
+        
+        assert _interval_cv(timestamps) == pytest.approx(FFTDetector._interval_cv(timestamps), rel=1e-9)
+    
+    def test_interval_cv_undefined(self):
+        """Test that missing or zero-length intervals give NaN"""
+        assert math.isnan(_interval_cv(np.array([5.0])))
+        assert math.isnan(_interval_cv(np.array([5.0, 5.0, 5.0])))
+        assert math.isnan(FFTDetector._interval_cv(np.array([5.0, 5.0, 5.0])))
 
 class TestGraphDetector:
     """Test cases for GraphDetector"""
@@ -260,4 +282,29 @@ class TestAnomalyDetector:
         context_update = self.detector.detect(actors, context)
         
         # Should return empty context for insufficient actors
-        assert context_update == {} 
\ No newline at end of file
+        assert context_update == {} 
+
+class TestMetaDetector:
+    """Test cases for MetaDetector"""
+
+    def test_cross_validation_from_trail_columns(self):
+        """Test confirmations, contradictions and confidence adjustments"""
+        detector = MetaDetector({})
+        actor = ActorProfile(ip_address='192.168.1.100')
+        actor.tags = {'LFI_ATTACK', 'SQLI_ATTACK', 'BOT_ACTIVITY'}
+        actor.add_evidence('FFTDetector', 'rhythmic_pattern', 'cv=0.01', 0.5)
+        actor.add_evidence('AnomalyDetector', 'anomaly', 'outlier', 0.5)
+        actor.evidence_trail.append({
+            'source': 'FFTDetector', 'confidence': 0.5, 'description': 'No rhythmic pattern found'
+        })
+
+        detector.detect({'192.168.1.100': actor})
+
+        assert {'CONFIRMED_BOTNET', 'CONFIRMED_SOPHISTICATED', 'INCONSISTENT_TIMING'} <= actor.tags
+        assert 'FALSE_POSITIVE' not in actor.tags
+        trail = actor.evidence_trail
+        # +0.2 per confirmation naming the source, -0.2 for inconsistent timing
+        assert trail.confidences[0] == pytest.approx(0.7)
+        assert trail.confidences[1] == pytest.approx(0.7)
+        assert trail[2]['confidence'] == pytest.approx(0.7)
+        assert trail.sources[-2:] == ['MetaDetector', 'MetaDetector']
@@ -0,0 +1,58 @@
+"""
+Unit tests for SIGMA-PROBE log ingestion helpers
+"""
+
+import pytest
+from datetime import datetime
+
+from sigma_probe.pipeline.ingestion import LogIngestionStage, _fast_clf_timestamp
+
+
+CLF_FORMAT = '%d/%b/%Y:%H:%M:%S %z'
+
+
+class TestFastClfTimestamp:
+    """Test cases for the strptime-free Common Log Format timestamp parser"""
+
+    @pytest.mark.parametrize("time_str", [
+        "01/Jan/2024:12:34:56 +0000",
+        "29/Feb/2024:23:59:59 +0300",
+        "15/Dec/1999:00:00:00 -0530",
+        "07/Jul/2030:08:05:01 +1445",
+        "1/Jan/2024:12:00:00 +0000",
+        "01/jan/2024:12:00:00 +0000",
+    ])
+    def test_matches_strptime(self, time_str):
+        """Test that results, including tz offsets, equal datetime.strptime"""
+        parsed = _fast_clf_timestamp(time_str)
+        expected = datetime.strptime(time_str, CLF_FORMAT)
+
+        assert parsed == expected
+        assert parsed.utcoffset() == expected.utcoffset()
+
+    @pytest.mark.parametrize("time_str", [
+        "32/Jan/2024:12:00:00 +0000",
+        "01/Foo/2024:12:00:00 +0000",
+        "01/Jan/2024:12:00:00 +0575",
+        "not a timestamp",
+    ])
+    def test_invalid_raises_value_error(self, time_str):
+        """Test that malformed timestamps still raise ValueError"""
+        with pytest.raises(ValueError):
+            _fast_clf_timestamp(time_str)
+
+
+class TestLogIngestionStage:
+    """Test cases for LogIngestionStage file reading"""
+
+    def test_non_utf8_bytes_do_not_abort_loading(self, tmp_path):
+        """Test that an undecodable byte is replaced instead of failing the file"""
+        log_path = tmp_path / "access.log"
+        log_path.write_bytes(
+            b'203.0.113.7 - - [01/Jan/2024:12:34:56 +0000] "GET / HTTP/1.1" 200 512 "-" "agent-\xff"\n'
+        )
+
+        stage = LogIngestionStage({'format': 'nginx', 'log_path': str(log_path)})
+        context = stage.process({})
+
+        assert isinstance(context['events'], list)
@@ -13,13 +13,25 @@ errors, which is the desired outcome — it forces the gap to be addressed
 rather than silently dropped.
 """
 
+from datetime import datetime
 from pathlib import Path
 
 import pytest
 
+from sigma_probe.intelligence.ioc_manager import IoCFeed
 from sigma_probe.main import HeliosPipeline  # noqa: F401  (import smoke check)
 from sigma_probe.models.core import ActorProfile, LogEvent  # noqa: F401
 
+# Served instead of the configured feed URLs, so the scenario never hits the network
+STUB_LFI_PATTERNS = {'../', '..%2f', '/etc/passwd', 'php://filter'}
+
+
+def _load_stub_patterns(feed: IoCFeed) -> bool:
+    """In-memory replacement for IoCFeed.load_patterns"""
+    feed.patterns = set(STUB_LFI_PATTERNS)
+    feed.last_update = datetime.now()
+    return True
+
 
 @pytest.mark.skip(
     reason=(
@@ -31,10 +43,9 @@ from sigma_probe.models.core import ActorProfile, LogEvent  # noqa: F401
 class TestLFIAttackScenario:
     """Behavioral test for LFI attack detection scenario"""
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def pipeline(self):
         """Create pipeline with test configuration"""
-        # Create temporary config file
         config = {
             'pipeline': {
                 'stages': ['ingestion', 'enrichment', 'profiling', 'detection', 'metadetection', 'scoring', 'reporting']
@@ -74,44 +85,33 @@ class TestLFIAttackScenario:
             }
         }
         
-        # Write config to temporary file
-        import tempfile
-        import yaml
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(config, f)
-            config_path = f.name
-        
-        try:
-            return HeliosPipeline(config_path)
-        finally:
-            # Clean up temp file
-            import os
-            os.unlink(config_path)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(IoCFeed, 'load_patterns', _load_stub_patterns)
+            yield HeliosPipeline(config)
     
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def scenario_log_path(self):
         """Path to the LFI attack scenario log"""
         return Path(__file__).parent / 'scenarios' / 'lfi_attack_scenario.log'
     
-    def test_lfi_attack_detection(self, pipeline, scenario_log_path):
+    @pytest.fixture(scope="class")
+    def results(self, pipeline, scenario_log_path):
+        """Pipeline results for the scenario, computed once for the class"""
+        return pipeline.run(str(scenario_log_path))
+    
+    @pytest.fixture(scope="class")
+    def main_actor(self, results):
+        """Profile of the attacking IP (192.168.1.100)"""
+        actor = results['actors_by_ip'].get('192.168.1.100')
+        assert actor is not None, "Should detect the attacking IP"
+        return actor
+    
+    def test_lfi_attack_detection(self, results, main_actor):
         """Test that LFI attack is properly detected and scored"""
-        # Run pipeline on scenario
-        results = pipeline.run(str(scenario_log_path))
-        
         # Verify we have actors
         assert 'actors' in results, "Pipeline should return actors"
         assert len(results['actors']) > 0, "Should detect at least one actor"
         
-        # Get the main actor (192.168.1.100)
-        main_actor = None
-        for actor in results['actors']:
-            if actor.ip == '192.168.1.100':
-                main_actor = actor
-                break
-        
-        assert main_actor is not None, "Should detect the attacking IP"
-        
         # Verify LFI attack detection
         assert 'LFI_ATTACK' in main_actor.tags, "Should detect LFI attack patterns"
         
@@ -136,18 +136,8 @@ class TestLFIAttackScenario:
             detected_meta_tags = meta_tags.intersection(main_actor.tags)
             assert len(detected_meta_tags) > 0, "MetaDetector should add cross-validation tags"
     
-    def test_adaptive_timing_detection(self, pipeline, scenario_log_path):
+    def test_adaptive_timing_detection(self, main_actor):
         """Test that adaptive timing patterns are detected"""
-        results = pipeline.run(str(scenario_log_path))
-        
-        main_actor = None
-        for actor in results['actors']:
-            if actor.ip == '192.168.1.100':
-                main_actor = actor
-                break
-        
-        assert main_actor is not None
-        
         # Check for FFT evidence indicating adaptive timing
         fft_evidence = [e for e in main_actor.evidence_trail if 'FFTDetector' in e.get('source', '')]
         assert len(fft_evidence) > 0, "Should have FFT analysis evidence"
@@ -158,18 +148,8 @@ class TestLFIAttackScenario:
             # Adaptive timing detected
             assert 'BOT_ACTIVITY' in main_actor.tags, "Adaptive timing should trigger bot detection"
     
-    def test_ioc_integration(self, pipeline, scenario_log_path):
+    def test_ioc_integration(self, main_actor):
         """Test that IoC feeds are integrated into detection"""
-        results = pipeline.run(str(scenario_log_path))
-        
-        main_actor = None
-        for actor in results['actors']:
-            if actor.ip == '192.168.1.100':
-                main_actor = actor
-                break
-        
-        assert main_actor is not None
-        
         # Check for IoC-based evidence
         ioc_evidence = [e for e in main_actor.evidence_trail 
                        if 'IoC' in e.get('source', '') or 'feed' in e.get('description', '').lower()]
@@ -179,18 +159,8 @@ class TestLFIAttackScenario:
         if ioc_evidence:
             assert 'LFI_ATTACK' in main_actor.tags, "IoC evidence should support LFI detection"
     
-    def test_evidence_confidence_scoring(self, pipeline, scenario_log_path):
+    def test_evidence_confidence_scoring(self, main_actor):
         """Test that evidence confidence affects threat scoring"""
-        results = pipeline.run(str(scenario_log_path))
-        
-        main_actor = None
-        for actor in results['actors']:
-            if actor.ip == '192.168.1.100':
-                main_actor = actor
-                break
-        
-        assert main_actor is not None
-        
         # Check that high-confidence evidence exists
         high_confidence_evidence = [e for e in main_actor.evidence_trail 
                                   if e.get('confidence', 0) > 0.8]
@@ -199,10 +169,8 @@ class TestLFIAttackScenario:
         # Verify threat score reflects evidence confidence
         assert main_actor.threat_score > 7.0, "High confidence evidence should result in high threat score"
     
-    def test_campaign_clustering(self, pipeline, scenario_log_path):
+    def test_campaign_clustering(self, results):
         """Test that actors are properly clustered into campaigns"""
-        results = pipeline.run(str(scenario_log_path))
-        
         # Check for campaign formation
         assert 'campaigns' in results, "Should identify threat campaigns"
         
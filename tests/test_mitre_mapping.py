@@ -0,0 +1,28 @@
+"""
+Unit tests for SIGMA-PROBE MITRE ATT&CK Mapping
+"""
+
+import copy
+import pickle
+
+from sigma_probe.intelligence.mitre_mapping import MitreMapping, MitreTechnique
+
+class TestMitreMapping:
+    """Test cases for MitreMapping"""
+    
+    def test_techniques_for_tags(self):
+        """Test tag lookup deduplicates techniques"""
+        mapping = MitreMapping()
+        techniques = mapping.get_techniques_for_tags(['LFI_ATTACK', 'SQLI_ATTACK'])
+        
+        assert sorted(t.technique_id for t in techniques) == ['T1083', 'T1190']
+        assert mapping.get_technique_by_id('T9999') is None
+    
+    def test_technique_round_trip(self):
+        """Test frozen slotted techniques survive pickle and deepcopy"""
+        technique = MitreMapping().get_technique_by_id('T1190')
+        
+        for clone in (pickle.loads(pickle.dumps(technique)), copy.deepcopy(technique), copy.copy(technique)):
+            assert isinstance(clone, MitreTechnique)
+            assert clone == technique
+            assert hash(clone) == hash(technique)
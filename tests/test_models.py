@@ -2,10 +2,13 @@
 Unit tests for SIGMA-PROBE Data Models
 """
 
+import pickle
+import sys
+
 import pytest
 from datetime import datetime
 
-from sigma_probe.models.core import LogEvent, ActorProfile
+from sigma_probe.models.core import LogEvent, ActorProfile, EvidenceTrail
 
 class TestLogEvent:
     """Test cases for LogEvent model"""
@@ -252,7 +255,135 @@ class TestActorProfile:
         assert actor.total_requests == 5
         assert actor.unique_urls == 5
         assert actor.url_diversity_ratio == 1.0  # All URLs are unique
-    
+
+    def test_add_event_interns_urls(self):
+        """Test that add_event counts interned URLs without changing the events"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        urls = ["".join(["/shared", "?page=", "1"]) for _ in range(2)]
+
+        for url in urls:
+            actor.add_event(LogEvent(
+                timestamp=datetime.now(),
+                source_ip="192.168.1.100",
+                url=url,
+                method="GET",
+                status_code=200
+            ))
+
+        assert [event.url for event in actor.events] == urls
+        assert actor.events[0].url is not actor.events[1].url
+        assert list(actor.url_frequency_vector)[0] is sys.intern(urls[0])
+        assert actor.unique_urls == 1
+
+    def test_incremental_metrics_match_recalculation(self):
+        """Test that add_event keeps metrics equal to a full recalculation"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        urls = ["/a", "/b", "/a", "/c?x=1", "/a"]
+        
+        for i, url in enumerate(urls):
+            event = LogEvent(
+                timestamp=datetime.now(),
+                source_ip="192.168.1.100",
+                url=url,
+                method="GET",
+                status_code=200
+            )
+            event.calculate_features()
+            if i == 3:
+                # Appended directly: the next add_event must resynchronize
+                actor.events.append(event)
+            else:
+                actor.add_event(event)
+        
+        incremental = actor.model_dump(include={'total_requests', 'unique_urls', 'url_diversity_ratio',
+                                                'avg_entropy', 'max_entropy', 'url_frequency_vector'})
+        actor.calculate_metrics()
+        
+        assert incremental == actor.model_dump(include=set(incremental))
+        assert actor.total_requests == 5
+        assert actor.unique_urls == 3
+        assert actor.url_frequency_vector["/a"] == 0.6
+
+    def test_add_event_after_events_reassigned(self):
+        """Test that reassigning events of the same length triggers a rebuild"""
+        def make_event(url):
+            return LogEvent(
+                timestamp=datetime.now(),
+                source_ip="192.168.1.100",
+                url=url,
+                method="GET",
+                status_code=200
+            )
+        
+        actor = ActorProfile(ip_address="192.168.1.100")
+        actor.add_event(make_event("/a"))
+        actor.add_event(make_event("/a"))
+        actor.events = [make_event("/x"), make_event("/y")]
+        actor.add_event(make_event("/z"))
+        
+        assert actor.total_requests == 3
+        assert actor.unique_urls == 3
+        assert dict(actor.url_frequency_vector) == {"/x": 1 / 3, "/y": 1 / 3, "/z": 1 / 3}
+        
+        # Round trips keep the tracked list in step with events
+        clone = pickle.loads(pickle.dumps(actor))
+        clone.add_event(make_event("/x"))
+        assert clone.unique_urls == 3
+        assert clone.url_frequency_vector["/x"] == 0.5
+
+    def test_url_frequency_vector_view(self):
+        """Test that the frequency vector follows add_event and dumps as a dict"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        for url in ["/a", "/b", "/a", "/a"]:
+            actor.add_event(LogEvent(
+                timestamp=datetime.now(),
+                source_ip="192.168.1.100",
+                url=url,
+                method="GET",
+                status_code=200
+            ))
+
+        assert actor.url_frequency_vector == {"/a": 0.75, "/b": 0.25}
+        assert sorted(actor.url_frequency_vector.values()) == [0.25, 0.75]
+        assert actor.model_dump()['url_frequency_vector'] == {"/a": 0.75, "/b": 0.25}
+        assert "/c" not in actor.url_frequency_vector
+
+        restored = ActorProfile.model_validate_json(actor.model_dump_json())
+        assert restored.url_frequency_vector == actor.url_frequency_vector
+
+    def test_timestamp_array(self):
+        """Test the timestamp column kept by add_event and its rebuild"""
+        def make_event(second):
+            return LogEvent(
+                timestamp=datetime(2024, 1, 1, 12, 0, second),
+                source_ip="192.168.1.100",
+                url="/",
+                method="GET",
+                status_code=200
+            )
+
+        actor = ActorProfile(ip_address="192.168.1.100")
+        for second in (0, 10, 5):
+            actor.add_event(make_event(second))
+        expected = [e.timestamp.timestamp() for e in actor.events]
+        assert actor.timestamp_array().tolist() == expected
+
+        # Appended directly: the column is rebuilt on the next read
+        actor.events.append(make_event(20))
+        assert actor.timestamp_array().tolist() == expected + [make_event(20).timestamp.timestamp()]
+        actor.add_event(make_event(30))
+        assert len(actor.timestamp_array()) == 5
+
+        constructed = ActorProfile(ip_address="192.168.1.100", events=list(actor.events))
+        assert constructed.timestamp_array().tolist() == actor.timestamp_array().tolist()
+
+        # Reassigned with the same length: the column follows the new list
+        actor.events = [make_event(second) for second in (1, 2, 3, 4, 5)]
+        assert actor.timestamp_array().tolist() == [e.timestamp.timestamp() for e in actor.events]
+        actor.events = [make_event(second) for second in (6, 7, 8, 9, 10)]
+        actor.add_event(make_event(11))
+        assert actor.timestamp_array().tolist() == [e.timestamp.timestamp() for e in actor.events]
+
     def test_tag_addition(self):
         """Test adding tags to actor"""
         actor = ActorProfile(ip_address="192.168.1.100")
@@ -264,6 +395,19 @@ class TestActorProfile:
         assert "AUTOMATED_SCAN" in actor.tags
         assert len(actor.evidence_trail) == 2
     
+    def test_finalize_normalizes_tags(self):
+        """Test that finalize leaves tags a mutable set"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        actor.tags = ["LFI_RFI", "AUTOMATED_SCAN"]
+        
+        actor.finalize()
+        assert type(actor.tags) is set
+        assert actor.tags == {"LFI_RFI", "AUTOMATED_SCAN"}
+        
+        actor.tags.add("XSS")
+        actor.add_tag("SQL_INJECTION", "test")
+        assert actor.tags == {"LFI_RFI", "AUTOMATED_SCAN", "XSS", "SQL_INJECTION"}
+    
     def test_evidence_addition(self):
         """Test adding evidence to actor"""
         actor = ActorProfile(ip_address="192.168.1.100")
@@ -277,6 +421,50 @@ class TestActorProfile:
         assert evidence['details'] == "Test evidence"
         assert evidence['confidence'] == 0.8
     
+    def test_deferred_evidence_details(self):
+        """Test that (fmt, args) details are formatted only when read"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        
+        actor.add_evidence("ScoringEngine", "threat_score_calculated", ("Final threat score: {:.2f}", (7.456,)), 0.9)
+        actor.add_tag("LFI_RFI", "test")
+        
+        assert actor.evidence_trail.details[0] == ("Final threat score: {:.2f}", (7.456,))
+        assert [e['details'] for e in actor.evidence_trail] == ["Final threat score: 7.46", "Added tag: LFI_RFI"]
+        assert next(actor.iter_evidence()).details == "Final threat score: 7.46"
+        assert actor.evidence_trail.to_list()[1]['details'] == "Added tag: LFI_RFI"
+    
+    def test_evidence_trail_columns(self):
+        """Test that the columnar trail reads back like a list of dicts"""
+        actor = ActorProfile(ip_address="192.168.1.100")
+        for i in range(4):
+            actor.add_evidence("TestDetector", "test_type", f"Evidence {i}", 0.25 * i)
+        actor.evidence_trail.append({'source': 'MetaDetector', 'confidence': 0.9, 'description': 'Meta'})
+        trail = actor.evidence_trail
+        
+        assert isinstance(trail, EvidenceTrail)
+        assert len(trail) == 5
+        assert [e['details'] for e in trail[1:3]] == ["Evidence 1", "Evidence 2"]
+        assert trail[-1] == {'source': 'MetaDetector', 'confidence': 0.9, 'description': 'Meta'}
+        assert list(trail.confidences) == [0.0, 0.25, 0.5, 0.75, 0.9]
+        assert [e.details for e in actor.iter_evidence()][:2] == ["Evidence 0", "Evidence 1"]
+        assert datetime.fromisoformat(trail[0]['timestamp'])
+        
+        assert trail.get_field(1, 'details') == "Evidence 1"
+        assert trail.get_field(1, 'description', '') == ''
+        assert trail.get_field(4, 'description') == 'Meta'
+        
+        # Entries read back are copies; set_confidence updates the trail
+        trail[0]['confidence'] = 0.75
+        assert trail[0]['confidence'] == 0.0
+        trail.set_confidence(-1, 0.5)
+        trail.set_confidence(0, 1.0)
+        assert trail[-1]['confidence'] == 0.5
+        assert trail[0]['confidence'] == 1.0
+        
+        assert pickle.loads(pickle.dumps(actor)).evidence_trail == trail.to_list()
+        assert actor.model_dump()['evidence_trail'] == trail.to_list()
+        assert ActorProfile(ip_address="10.0.0.1", evidence_trail=trail.to_list()).evidence_trail == trail
+    
     def test_behavioral_vector(self):
         """Test behavioral vector generation"""
         actor = ActorProfile(ip_address="192.168.1.100")
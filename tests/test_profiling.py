@@ -0,0 +1,131 @@
+"""
+Unit tests for SIGMA-PROBE Actor Profiling stages
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import numpy as np
+
+from sigma_probe.models.core import LogEvent
+from sigma_probe.pipeline._enrichment_kernels import _agg
+from sigma_probe.pipeline.profiling import ActorProfilingStage, ActorEnrichmentStage
+
+
+def make_event(seconds: int, method: str = "GET", status: int = 200, url: str = "/"):
+    """Lightweight stand-in for a parsed LogEvent"""
+    return SimpleNamespace(
+        timestamp=datetime(2024, 1, 1, 12, 0, 0) + timedelta(seconds=seconds),
+        http_method=method,
+        status_code=status,
+        url_normalized=url,
+        user_agent="test-agent",
+    )
+
+
+class TestEnrichmentKernels:
+    """Test cases for the enrichment aggregation kernel"""
+
+    def test_agg_counts_and_range(self):
+        """Test single-pass bincounts and min/max"""
+        timestamps = np.array([30.0, 10.0, 50.0, 20.0])
+        status_codes = np.array([200, 404, 200, 500])
+        method_ids = np.array([0, 1, 0, 0])
+
+        method_counts, status_counts, tmin, tmax = _agg(
+            timestamps, status_codes, method_ids, 501, 2
+        )
+
+        assert list(method_counts) == [3, 1]
+        assert status_counts[200] == 2
+        assert status_counts[404] == 1
+        assert status_counts[500] == 1
+        assert status_counts.sum() == 4
+        assert tmin == 10.0
+        assert tmax == 50.0
+
+
+class TestActorEnrichmentStage:
+    """Test cases for ActorEnrichmentStage"""
+
+    def test_columnar_aggregation_matches_python_path(self):
+        """Test that the kernel path produces the same distributions"""
+        events = [
+            make_event(0, "GET", 200),
+            make_event(5, "POST", 302),
+            make_event(12, "GET", 404),
+            make_event(3, "GET", 200),
+        ]
+
+        method_counts, status_counts, time_span = ActorEnrichmentStage._aggregate_columnar(events)
+
+        assert method_counts == {"GET": 3, "POST": 1}
+        assert status_counts == {200: 2, 302: 1, 404: 1}
+        assert time_span == 12.0
+
+    def test_enrich_actor_profile_distributions(self):
+        """Test behavioral signatures built by the Python path"""
+        stage = ActorEnrichmentStage({})
+        actor = SimpleNamespace(
+            events=[
+                make_event(0, "GET", 200, "/a"),
+                make_event(10, "GET", 404, "/b"),
+                make_event(20, "HEAD", 200, "/a"),
+            ],
+            behavioral_signatures={},
+        )
+
+        stage._enrich_actor_profile(actor)
+
+        signatures = actor.behavioral_signatures
+        assert signatures['method_distribution'] == {"GET": 2, "HEAD": 1}
+        assert signatures['status_distribution'] == {200: 2, 404: 1}
+        assert type(signatures['method_distribution']) is dict
+        assert signatures['unique_urls_count'] == 2
+        assert signatures['time_span_seconds'] == 20.0
+
+
+class TestActorProfilingStage:
+    """Test cases for ActorProfilingStage"""
+
+    def create_events(self):
+        ips = ["10.0.0.2", "10.0.0.1", "10.0.0.2", "192.168.1.100", "10.0.0.1"]
+        return [
+            LogEvent(
+                timestamp=datetime(2024, 1, 1) + timedelta(seconds=i),
+                source_ip=ip,
+                url=f"/page{i}",
+                method="GET",
+                status_code=200,
+            )
+            for i, ip in enumerate(ips)
+        ]
+
+    def test_vectorized_grouping_matches_dict_grouping(self):
+        """Test that argsort grouping keeps actor and event order"""
+        events = self.create_events()
+
+        default_actors = ActorProfilingStage({}).process({'events': events})['actors']
+        vectorized_stage = ActorProfilingStage({'vectorized_grouping_min_events': 1})
+        vectorized_actors = vectorized_stage.process({'events': events})['actors']
+
+        assert list(vectorized_actors) == list(default_actors) == [
+            "10.0.0.2", "10.0.0.1", "192.168.1.100"
+        ]
+        for ip, actor in default_actors.items():
+            assert [e.url for e in vectorized_actors[ip].events] == [e.url for e in actor.events]
+
+    def test_vectorized_grouping_falls_back_for_ipv6(self):
+        """Test that a non-IPv4 address above the threshold uses dict grouping"""
+        events = self.create_events()
+        events[2].source_ip = "2001:db8::1"
+
+        default_actors = ActorProfilingStage({}).process({'events': events})['actors']
+        vectorized_stage = ActorProfilingStage({'vectorized_grouping_min_events': 1})
+        vectorized_actors = vectorized_stage.process({'events': events})['actors']
+
+        assert list(vectorized_actors) == list(default_actors) == [
+            "10.0.0.2", "10.0.0.1", "2001:db8::1", "192.168.1.100"
+        ]
+        assert [e.url for e in vectorized_actors["2001:db8::1"].events] == ["/page2"]
@@ -0,0 +1,178 @@
+"""
+Unit tests for SIGMA-PROBE Narrative Engine
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sigma_probe.models.core import ActorProfile, LogEvent
+from sigma_probe.pipeline.recommendations import NarrativeEngine, Recommendation
+
+
+def make_recommendation(priority: str, category: str = "MONITORING") -> Recommendation:
+    """Helper to build a recommendation with placeholder text"""
+    return Recommendation(
+        priority=priority,
+        category=category,
+        title=f"{priority} recommendation",
+        description="",
+        action_items=(),
+        mitre_techniques=(),
+        confidence=0.5
+    )
+
+
+class TestRecommendation:
+    """Test cases for Recommendation"""
+    
+    def test_priority_rank(self):
+        """Test numeric priority derived at construction"""
+        assert make_recommendation("HIGH").priority_rank == 3
+        assert make_recommendation("MEDIUM").priority_rank == 2
+        assert make_recommendation("LOW").priority_rank == 1
+        assert make_recommendation("UNKNOWN").priority_rank == 0
+
+
+class TestNarrativeEngine:
+    """Test cases for NarrativeEngine"""
+    
+    def create_actors(self, count: int, threat_score: float, tags: set) -> list:
+        actors = []
+        for i in range(count):
+            actor = ActorProfile(ip_address=f"10.0.0.{i}")
+            actor.threat_score = threat_score
+            actor.tags = set(tags)
+            actors.append(actor)
+        return actors
+    
+    def test_global_recommendations(self):
+        """Test global recommendations for many high-threat botnet actors"""
+        engine = NarrativeEngine({})
+        actors = self.create_actors(6, 9.0, {'CONFIRMED_BOTNET'})
+        
+        recommendations = engine.generate_recommendations(actors, [])
+        
+        assert [r.title for r in recommendations] == [
+            "High Volume of Threat Actors Detected",
+            "Multiple Botnet Activities Detected",
+        ]
+        assert all(r.priority_rank == 3 for r in recommendations)
+        assert recommendations[0].description.startswith("Обнаружено 6 ")
+        assert recommendations[1].description.startswith("Обнаружено 6 ")
+        
+        summary = engine.get_recommendations_summary()
+        assert summary["high_priority"] == summary["immediate_actions"] == 2
+        
+        again = engine.generate_recommendations(actors, [])
+        assert again[0].action_items is recommendations[0].action_items
+        assert again[0].mitre_techniques == ("T1190", "T1595")
+    
+    def test_no_global_recommendations_below_thresholds(self):
+        """Test that few actors produce no global recommendations"""
+        engine = NarrativeEngine({})
+        actors = self.create_actors(3, 9.0, {'CONFIRMED_BOTNET'})
+        
+        assert engine.generate_recommendations(actors, []) == []
+    
+    def test_recommendations_summary(self):
+        """Test priority and category counts in the summary"""
+        engine = NarrativeEngine({})
+        engine.recommendations = [
+            make_recommendation("HIGH", "IMMEDIATE_ACTION"),
+            make_recommendation("HIGH", "IMMEDIATE_ACTION"),
+            make_recommendation("MEDIUM", "INVESTIGATION"),
+            make_recommendation("LOW", "MONITORING"),
+            make_recommendation("UNKNOWN", "OTHER"),
+        ]
+        
+        assert engine.get_recommendations_summary() == {
+            "total_recommendations": 5,
+            "high_priority": 2,
+            "medium_priority": 1,
+            "low_priority": 1,
+            "immediate_actions": 2,
+            "investigations": 1,
+            "monitoring": 1
+        }
+    
+    def test_summary_follows_recommendations(self):
+        """Test that recommendations are read-only so the summary cannot go stale"""
+        engine = NarrativeEngine({})
+        recommendations = [make_recommendation("HIGH", "IMMEDIATE_ACTION")]
+        engine.recommendations = recommendations
+        recommendations.append(make_recommendation("LOW", "MONITORING"))
+        
+        with pytest.raises(AttributeError):
+            engine.recommendations.append(make_recommendation("LOW", "MONITORING"))
+        assert len(engine.recommendations) == 1
+        
+        engine.recommendations = recommendations
+        summary = engine.get_recommendations_summary()
+        assert summary["total_recommendations"] == 2
+        assert summary["low_priority"] == summary["monitoring"] == 1
+    
+    def test_empty_summary(self):
+        """Test summary before any recommendations are generated"""
+        assert NarrativeEngine({}).get_recommendations_summary() == {
+            "message": "No recommendations generated"
+        }
+    
+    def test_actor_rules_first_match_wins(self):
+        """Test that only the first matching actor rule produces a recommendation"""
+        engine = NarrativeEngine({})
+        actor = SimpleNamespace(
+            ip="203.0.113.7",
+            first_seen=datetime(2024, 1, 1, 12, 0),
+            last_seen=datetime(2024, 1, 1, 13, 0),
+            tags={'CONFIRMED_BOTNET', 'SQLI_ATTACK', 'ISOLATED_INDICATOR'},
+        )
+        
+        recommendations = engine._analyze_actor(actor)
+        
+        assert len(recommendations) == 1
+        assert recommendations[0].title == "Botnet SQL Injection Attack - 203.0.113.7"
+        
+        actor.tags = {'ISOLATED_INDICATOR'}
+        assert [r.priority for r in engine._analyze_actor(actor)] == ["LOW"]
+        
+        actor.tags = {'SQLI_ATTACK'}
+        assert engine._analyze_actor(actor) == []
+        
+        # Tags assigned as a list are matched as well
+        actor.tags = ['SQLI_ATTACK', 'CONFIRMED_BOTNET']
+        assert len(engine._analyze_actor(actor)) == 1
+    
+    def test_actor_recommendation_from_profile(self):
+        """Test template fields taken from an ActorProfile and its events"""
+        engine = NarrativeEngine({})
+        actor = ActorProfile(ip_address="198.51.100.4")
+        actor.events = [
+            LogEvent(
+                timestamp=datetime(2024, 1, 1, 12, 0) + timedelta(minutes=minutes),
+                source_ip="198.51.100.4",
+                url="/index.php",
+                method="GET",
+                status_code=200,
+            )
+            for minutes in (30, 0, 45)
+        ]
+        actor.tags = {'CONFIRMED_BOTNET', 'SQLI_ATTACK'}
+        
+        [recommendation] = engine._analyze_actor(actor)
+        
+        assert recommendation.title == "Botnet SQL Injection Attack - 198.51.100.4"
+        assert recommendation.description.endswith(
+            "Активность: 2024-01-01 12:00:00 - 2024-01-01 12:45:00"
+        )
+        assert recommendation.action_items[0] == (
+            "Немедленно заблокировать IP 198.51.100.4 на файрволе (уровень 7)"
+        )
+    
+    def test_recommendation_has_no_instance_dict(self):
+        """Test that recommendations are slotted"""
+        recommendation = make_recommendation("HIGH")
+        
+        assert not hasattr(recommendation, '__dict__')
+        with pytest.raises(AttributeError):
+            recommendation.unexpected = True
@@ -0,0 +1,66 @@
+"""
+Unit tests for SIGMA-PROBE Reporting
+"""
+
+import json
+import math
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from sigma_probe.models.core import ActorProfile
+from sigma_probe.pipeline import reporting
+from sigma_probe.pipeline.reporting import ReportingStage
+
+
+class TestJsonReport:
+    """Test cases for the JSON report"""
+
+    def create_data(self):
+        actor = ActorProfile(ip_address="192.168.1.100")
+        actor.add_tag("LFI_RFI", "test")
+        actor.threat_score = np.float64(7.5)
+        context = {
+            'detected_at': datetime(2024, 1, 1, 12, 0),
+            'cluster_sizes': {0: 3, -1: 1},
+            'vector': np.arange(3),
+        }
+        return {'actors': [actor], 'campaigns': [], 'context': context}
+
+    def test_orjson_matches_json(self, monkeypatch):
+        """Test that the orjson path produces the same document as json"""
+        pytest.importorskip("orjson")
+        stage = ReportingStage({})
+        data = self.create_data()
+
+        fast = json.loads(stage._generate_json_report(data))
+        monkeypatch.setattr(reporting, "orjson", None)
+        slow = json.loads(stage._generate_json_report(data))
+
+        for report in (fast, slow):
+            report['metadata'].pop('generated_at')
+        assert fast == slow
+        assert fast['actors'][0]['threat_score'] == 7.5
+        assert fast['context']['cluster_sizes'] == {'0': 3, '-1': 1}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_non_ascii_and_nan(self, monkeypatch, use_orjson):
+        """Test that Cyrillic text is kept and NaN scores still parse on both paths"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(reporting, "orjson", None)
+        stage = ReportingStage({})
+        data = self.create_data()
+        data['actors'][0].threat_score = float('nan')
+        data['context']['note'] = "Сканирование каталогов"
+
+        text = stage._generate_json_report(data)
+        report = json.loads(text)
+
+        assert "Сканирование каталогов" in text
+        assert report['context']['note'] == "Сканирование каталогов"
+        score = report['actors'][0]['threat_score']
+        # json writes NaN, orjson writes null
+        assert score is None if use_orjson else math.isnan(score)
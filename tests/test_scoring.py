@@ -2,12 +2,21 @@
 Unit tests for SIGMA-PROBE Scoring Rules Engine
 """
 
+import pickle
 import pytest
 from datetime import datetime
 from unittest.mock import Mock
 
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+
 from sigma_probe.models.core import ActorProfile, LogEvent
-from sigma_probe.pipeline.rules_engine import ScoringRulesEngine
+from sigma_probe.pipeline._scoring_kernels import (
+    _base_score_kernel, _base_score_vectorized, _score_kernel, _score_vectorized,
+)
+from sigma_probe.pipeline.rules_engine import ScoringRulesEngine, _DYNAMIC_MODIFIER_LUT, inflate_evidence
+from sigma_probe.pipeline.scoring import ScoringEngine
 
 class TestScoringRulesEngine:
     """Test cases for ScoringRulesEngine"""
@@ -186,6 +195,15 @@ class TestScoringRulesEngine:
         assert score == 0.0
         assert len(evidence) == 0
     
+    def test_unscored_tags(self):
+        """Test that tags without a scoring profile contribute nothing"""
+        actor = self.create_test_actor('192.168.1.100', {'CLUSTER_MEMBER', 'SUSPICIOUS'}, avg_entropy=5.0)
+        
+        score, evidence = self.rules_engine.calculate_score(actor, {})
+        
+        assert score == 0.0
+        assert evidence == []
+    
     def test_high_entropy_modifier(self):
         """Test high entropy modifier condition"""
         actor = self.create_test_actor('192.168.1.100', {'LFI_RFI'}, avg_entropy=5.0)
@@ -227,4 +245,427 @@ class TestScoringRulesEngine:
         
         # Should apply anomalous behavior modifier (1.3)
         expected_score = 5.5 * 1.3
-        assert abs(score - expected_score) < 0.01 
\ No newline at end of file
+        assert abs(score - expected_score) < 0.01 
+    
+    def test_batch_scoring_matches_per_actor_scoring(self):
+        """Test that vectorized batch scoring reproduces calculate_score"""
+        actors = [
+            self.create_test_actor('10.0.0.1', {'LFI_RFI'}, avg_entropy=5.0),
+            self.create_test_actor('10.0.0.2', {'LFI_RFI', 'COORDINATED_ATTACK'}, centrality=0.9),
+            self.create_test_actor('10.0.0.3', {'AUTOMATED_SCAN', 'COORDINATOR'}, centrality=0.8),
+            self.create_test_actor('10.0.0.4', {'LFI_RFI', 'SQL_INJECTION', 'XSS', 'ANOMALOUS'}, anomaly_ratio=0.9),
+            self.create_test_actor('10.0.0.5', set()),
+        ]
+        contexts = [
+            {},
+            {
+                'fft_summary': {'prevalence': 0.6, 'is_rhythmic': True, 'total_actors': 150},
+                'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8},
+                'anomaly_summary': {'anomaly_rate': 0.4, 'anomalies': 12},
+                'clustering_summary': {'largest_cluster': 6},
+                'coordinated_attack': True,
+            },
+        ]
+        
+        for context in contexts:
+            batch = self.rules_engine.calculate_scores_batch(actors, context)
+            
+            assert len(batch) == len(actors)
+            for actor, (score, evidence) in zip(actors, batch):
+                expected_score, expected_evidence = self.rules_engine.calculate_score(actor, context)
+                assert score == pytest.approx(expected_score)
+                assert evidence == expected_evidence
+    
+    def test_parallel_scoring_matches_batch_scoring(self):
+        """Test that chunked thread-pool scoring keeps actor order and results"""
+        context = {
+            'fft_summary': {'prevalence': 0.6},
+            'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8},
+        }
+        actors = [
+            self.create_test_actor(f'10.0.0.{i}', tags, centrality=0.1 * i, avg_entropy=4.0 + 0.2 * i)
+            for i, tags in enumerate([
+                {'LFI_RFI'}, {'SQLI', 'AUTOMATED_SCAN'}, set(), {'COORDINATOR', 'LFI_RFI'},
+                {'AUTOMATED_SCAN'}, {'ANOMALOUS'}, {'LFI_RFI', 'COORDINATED_ATTACK'},
+            ])
+        ]
+        
+        expected = self.rules_engine.calculate_scores_batch(actors, context)
+        
+        assert self.rules_engine.calculate_scores_parallel(actors, context, n_workers=3) == expected
+        assert self.rules_engine.calculate_scores_parallel(actors, context, n_workers=1) == expected
+        assert self.rules_engine.calculate_scores_parallel([], context) == []
+    
+    def test_batch_scoring_wide_tag_vocabulary(self):
+        """Test the boolean-matrix fallback when tags do not fit a uint64 mask"""
+        config = dict(self.config)
+        config['scoring_profiles'] = dict(self.config['scoring_profiles'], **{
+            f'EXTRA_{i}': {'base_score': 0.1 * i} for i in range(64)
+        })
+        engine = ScoringRulesEngine(config)
+        actors = [
+            self.create_test_actor('10.0.0.1', {'EXTRA_3', 'LFI_RFI', 'AUTOMATED_SCAN'}, avg_entropy=5.0),
+            self.create_test_actor('10.0.0.2', {'EXTRA_63', 'COORDINATOR'}),
+        ]
+        
+        assert engine._tag_bits is None
+        assert self.rules_engine._tag_bits is not None
+        for (score, evidence), actor in zip(engine.calculate_scores_batch(actors, {}), actors):
+            expected_score, expected_evidence = engine.calculate_score(actor, {})
+            assert score == pytest.approx(expected_score)
+            assert evidence == expected_evidence
+    
+    def test_batch_scoring_empty(self):
+        """Test batch scoring with no actors"""
+        assert self.rules_engine.calculate_scores_batch([], {}) == []
+
+    
+    def test_context_view(self):
+        """Test scalar extraction into ContextView and scoring against it"""
+        context = {
+            'fft_summary': {'prevalence': 0.6, 'is_rhythmic': True, 'total_actors': 40},
+            'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8, 'total_actors': 150},
+            'coordinated_attack': True,
+        }
+        
+        view = self.rules_engine.make_context_view(context)
+        
+        assert view.prevalence == 0.6
+        assert view.is_rhythmic is True
+        assert view.has_graph is True
+        assert view.coordinators == 8
+        assert view.total_actors == 150
+        assert view.anomaly_rate == 0.0
+        assert view.largest_cluster == 0
+        assert view.coordinated_attack is True
+        with pytest.raises(AttributeError):
+            view.prevalence = 0.1
+        
+        actor = self.create_test_actor('192.168.1.100', {'LFI_RFI', 'AUTOMATED_SCAN'}, centrality=0.9)
+        assert self.rules_engine.calculate_score(actor, view) == self.rules_engine.calculate_score(actor, context)
+    
+    def test_evidence_tuples(self):
+        """Test that raw evidence tuples inflate to the public dict form"""
+        context = {'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8}}
+        actor = self.create_test_actor('192.168.1.100', {'LFI_RFI', 'AUTOMATED_SCAN'}, avg_entropy=5.0)
+        
+        score, evidence = self.rules_engine.calculate_score(actor, context)
+        raw_score, raw_evidence = self.rules_engine.calculate_score(actor, context, inflate=False)
+        
+        assert raw_score == score
+        assert all(type(item) is tuple for item in raw_evidence)
+        assert inflate_evidence(raw_evidence) == evidence
+        assert evidence[-1] == {
+            'source': 'RulesEngine',
+            'type': 'global_modifier',
+            'details': "Highly coordinated attack (8 coordinators)",
+            'confidence': 0.8,
+        }
+        
+        [(batch_score, batch_evidence)] = self.rules_engine.calculate_scores_batch([actor], context, inflate=False)
+        assert batch_evidence == raw_evidence
+    
+    def test_score_cache(self):
+        """Test that repeated scoring is served from the cache with fresh evidence"""
+        context = {'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8}}
+        actor = self.create_test_actor('192.168.1.100', {'SQLI', 'AUTOMATED_SCAN'}, centrality=0.9)
+        twin = self.create_test_actor('192.168.1.101', {'AUTOMATED_SCAN', 'SQLI'}, centrality=0.9)
+        
+        expected = self.rules_engine.calculate_score(actor, context)
+        expected[1][0]['score_change'] = -1
+        
+        assert len(self.rules_engine._score_cache) == 1
+        assert self.rules_engine.calculate_score(twin, context) != expected
+        score, evidence = self.rules_engine._calculate_score(twin, self.rules_engine.make_context_view(context))
+        assert self.rules_engine.calculate_score(twin, context) == (score, inflate_evidence(evidence))
+        assert len(self.rules_engine._score_cache) == 1
+        
+        twin.centrality = 0.90001
+        self.rules_engine.calculate_score(twin, context)
+        assert len(self.rules_engine._score_cache) == 2
+        
+        uncached = ScoringRulesEngine({**self.config, 'score_cache_size': 0})
+        assert uncached.calculate_score(actor, context) == self.rules_engine.calculate_score(actor, context)
+        assert not uncached._score_cache
+
+
+class TestScoringKernels:
+    """Test cases for the batch scoring kernels"""
+    
+    @pytest.mark.parametrize("prevalence, has_graph, avg_centrality, anomaly_rate, largest_cluster", [
+        (0.0, False, 0.0, 0.0, 0),
+        (0.6, True, 0.2, 0.4, 6),
+        (0.9, True, 0.0, 0.1, 5),
+    ])
+    def test_kernel_matches_vectorized(self, prevalence, has_graph, avg_centrality, anomaly_rate, largest_cluster):
+        """Test that the fused loop and the NumPy path give identical scores"""
+        rng = np.random.default_rng(0)
+        n = 64
+        args = (
+            rng.random(n) * 10, rng.choice([1.0, 1.4, 1.8], n), rng.random(n) < 0.3,
+            rng.integers(0, len(_DYNAMIC_MODIFIER_LUT), n), _DYNAMIC_MODIFIER_LUT,
+            rng.random(n) < 0.5, rng.random(n) < 0.5, rng.random(n), rng.random(n),
+            prevalence, has_graph, avg_centrality, anomaly_rate, largest_cluster, 1.56,
+        )
+        
+        assert np.array_equal(_score_kernel(*args), _score_vectorized(*args))
+    
+    def test_base_score_kernel_matches_vectorized(self):
+        """Test that the base score loop and the NumPy path give identical scores"""
+        rng = np.random.default_rng(1)
+        n = 64
+        offsets = np.array([0, 2, 2, 5], dtype=np.intp)
+        has_profile = rng.random((n, 3)) < 0.5
+        fired = (rng.random((n, 5)) < 0.5) & np.repeat(has_profile, [2, 0, 3], axis=1)
+        args = (has_profile, np.array([8.0, 5.5, 3.0]), offsets, np.array([1.3, 0.7, 1.1, 1.5, 0.9]), fired)
+        
+        has_profile[:2] = [[True, True, True], [False, False, False]]
+        fired[:2] = [[True, True, True, True, True], [False] * 5]
+        
+        scores = _base_score_kernel(*args)
+        
+        assert np.array_equal(scores, _base_score_vectorized(*args))
+        assert scores[0] == 8.0 * 1.3 * 0.7 + 5.5 + 3.0 * 1.1 * 1.5 * 0.9
+        assert scores[1] == 0.0
+
+
+class TestScoringEngine:
+    """Test cases for ScoringEngine campaign clustering"""
+    
+    def create_actor(self, ip: str, url_frequency_vector: dict) -> ActorProfile:
+        actor = ActorProfile(ip_address=ip)
+        actor.url_frequency_vector = url_frequency_vector
+        return actor
+    
+    def create_actors(self) -> list:
+        """Three identical actors, an identical pair and one outlier"""
+        return [
+            self.create_actor('10.0.0.1', {'/a': 0.5, '/b': 0.5}),
+            self.create_actor('10.0.0.2', {'/x': 1.0}),
+            self.create_actor('10.0.0.3', {'/a': 0.5, '/b': 0.5}),
+            self.create_actor('10.0.0.4', {'/p': 0.25, '/q': 0.25, '/r': 0.25, '/s': 0.25}),
+            self.create_actor('10.0.0.5', {'/x': 1.0}),
+            self.create_actor('10.0.0.6', {'/a': 0.5, '/b': 0.5}),
+            self.create_actor('10.0.0.7', {}),
+        ]
+    
+    def test_score_actors_batch_matches_per_actor(self):
+        """Test that batch scoring records the same scores and evidence"""
+        config = {
+            'scoring_profiles': {
+                'LFI_RFI': {'base_score': 8.0, 'modifiers': [{'if': 'high_entropy', 'value': 1.3}]},
+                'AUTOMATED_SCAN': {'base_score': 4.0},
+            },
+            'tag_combinations': {'LFI_RFI+AUTOMATED_SCAN': {'multiplier': 1.5}},
+        }
+        context = {'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8}}
+        
+        def create_actors():
+            actors = []
+            for i, tags in enumerate([{'LFI_RFI'}, {'LFI_RFI', 'AUTOMATED_SCAN'}, set(), {'AUTOMATED_SCAN'}]):
+                actor = ActorProfile(ip_address=f'10.0.0.{i}', avg_entropy=4.0 + i, centrality=0.3 * i)
+                actor.tags = tags
+                actors.append(actor)
+            return actors
+        
+        per_actor = ScoringEngine({**config, 'batch_min_actors': 1000}).score_actors(create_actors(), context)
+        batch = ScoringEngine({**config, 'batch_min_actors': 1}).score_actors(create_actors(), context)
+        
+        for expected, actor in zip(per_actor, batch):
+            assert actor.threat_score == pytest.approx(expected.threat_score)
+            assert [{k: v for k, v in e.items() if k != 'timestamp'} for e in actor.evidence_trail] == \
+                [{k: v for k, v in e.items() if k != 'timestamp'} for e in expected.evidence_trail]
+    
+    def test_score_actors_parallel_matches_batch(self):
+        """Test that joblib workers return the same scores and evidence"""
+        config = {
+            'scoring_profiles': {
+                'LFI_RFI': {'base_score': 8.0, 'modifiers': [{'if': 'high_entropy', 'value': 1.3}]},
+                'AUTOMATED_SCAN': {'base_score': 4.0},
+            },
+            'parallel_min_actors': 1,
+            'n_jobs': 2,
+        }
+        context = {'graph_summary': {'avg_centrality': 0.2, 'coordinators': 8}}
+        
+        def create_actors():
+            actors = []
+            for i in range(9):
+                actor = ActorProfile(ip_address=f'10.0.0.{i}', avg_entropy=3.0 + 0.3 * i, centrality=0.1 * i)
+                actor.tags = {'LFI_RFI', 'AUTOMATED_SCAN'} if i % 3 else {'LFI_RFI'}
+                actors.append(actor)
+            return actors
+        
+        engine = ScoringEngine(config)
+        engine.rules_engine.calculate_score(create_actors()[0], context)
+        parallel = engine.score_actors(create_actors(), context)
+        batch = ScoringEngine(config).score_actors_batch(create_actors(), context)
+        
+        assert [a.threat_score for a in parallel] == [a.threat_score for a in batch]
+        for actor, expected in zip(parallel, batch):
+            assert [e['details'] for e in actor.evidence_trail] == [e['details'] for e in expected.evidence_trail]
+        assert pickle.loads(pickle.dumps(engine.rules_engine))._score_cache == {}
+    
+    def test_cluster_campaigns(self):
+        """Test coordinated, paired and isolated actor detection"""
+        actors = self.create_actors()
+        
+        campaigns = ScoringEngine({}).cluster_campaigns(actors, {})
+        
+        assert sorted(sorted(a.ip_address for a in c.actors) for c in campaigns) == [
+            ['10.0.0.1', '10.0.0.3', '10.0.0.6'],
+            ['10.0.0.2', '10.0.0.5'],
+        ]
+        assert {a.ip_address for a in actors if 'COORDINATED_ATTACK' in a.tags} == {'10.0.0.1', '10.0.0.3', '10.0.0.6'}
+        assert {a.ip_address for a in actors if 'PAIRED_ATTACK' in a.tags} == {'10.0.0.2', '10.0.0.5'}
+        assert {a.ip_address for a in actors if 'ISOLATED_ATTACKER' in a.tags} == {'10.0.0.4'}
+        assert not actors[-1].tags
+    
+    def test_cluster_campaigns_reuses_dbscan(self):
+        """Test that the DBSCAN estimator is built once per engine"""
+        engine = ScoringEngine({})
+        
+        engine.cluster_campaigns(self.create_actors(), {})
+        dbscan = engine._dbscan
+        campaigns = engine.cluster_campaigns(self.create_actors(), {})
+        
+        assert dbscan is not None and engine._dbscan is dbscan
+        assert len(campaigns) == 2
+    
+    def test_cluster_campaigns_identical_vectors(self):
+        """Test that identical behavior forms one campaign without DBSCAN"""
+        actors = [self.create_actor(f'10.0.0.{i}', {'/a': 0.5, '/b': 0.5}) for i in range(4)]
+        engine = ScoringEngine({})
+        engine._dbscan_labels = Mock(side_effect=AssertionError("DBSCAN should be skipped"))
+        
+        campaigns = engine.cluster_campaigns(actors, {})
+        
+        assert [c.campaign_id for c in campaigns] == ['campaign_0']
+        assert campaigns[0].actors == actors
+        assert all('COORDINATED_ATTACK' in a.tags for a in actors)
+    
+    def test_cluster_campaigns_too_few_actors(self):
+        """Test that clustering needs at least two actors with behavior"""
+        engine = ScoringEngine({})
+        
+        assert engine.cluster_campaigns(self.create_actors()[:1], {}) == []
+        assert engine.cluster_campaigns([self.create_actor('10.0.0.1', {'/a': 1.0}),
+                                         self.create_actor('10.0.0.2', {})], {}) == []
+    
+    def test_standardize_matches_standard_scaler(self):
+        """Test in-place float32 standardization against StandardScaler"""
+        rng = np.random.default_rng(0)
+        vectors = rng.random((40, 50))
+        vectors[:, 20:] = 0.0
+        vectors[:, 3] = 0.1
+        
+        normalized = ScoringEngine._standardize(vectors.astype(np.float32))
+        
+        assert normalized.dtype == np.float32
+        np.testing.assert_allclose(normalized, StandardScaler().fit_transform(vectors), atol=1e-5)
+        assert not normalized[:, 3].any()
+    
+    def test_compiled_behavioral_vectors_match(self):
+        """Test that the CSR kernel reproduces get_behavioral_vector"""
+        rng = np.random.default_rng(0)
+        actors = [self.create_actor('10.0.0.0', {}), self.create_actor('10.0.0.1', {'/a': 0.5, '/b': 0.5})]
+        for i, url_count in enumerate([1, 7, 50, 80], start=2):
+            frequencies = rng.random(url_count)
+            frequencies /= frequencies.sum()
+            actors.append(self.create_actor(f'10.0.0.{i}', {f'/{j}': float(f) for j, f in enumerate(frequencies)}))
+        
+        expected, expected_actors = ScoringEngine._behavioral_vectors(actors)
+        vectors, valid_actors = ScoringEngine._behavioral_vectors_compiled(actors)
+        
+        assert valid_actors == expected_actors == actors[1:]
+        assert vectors.dtype == np.float32
+        assert np.array_equal(vectors, expected)
+    
+    def test_float32_neighbor_distances_within_tolerance(self):
+        """Test that float32 clustering input keeps float64 neighbor distances"""
+        rng = np.random.default_rng(1)
+        vectors = rng.random((60, 50))
+        vectors[:, 25:] = 0.0
+        vectors /= vectors.sum(axis=1, keepdims=True)
+        
+        reference = StandardScaler().fit_transform(vectors)
+        normalized = ScoringEngine._standardize(vectors.astype(np.float32))
+        
+        expected = NearestNeighbors(algorithm='brute').fit(reference).kneighbors(reference, 5)
+        distances, indices = NearestNeighbors(algorithm='brute').fit(normalized).kneighbors(normalized, 5)
+        
+        np.testing.assert_allclose(distances, expected[0], atol=1e-4)
+        assert np.array_equal(indices, expected[1])
+    
+    def test_radius_graph_gemm_matches_nearest_neighbors(self):
+        """Test the GEMM neighborhood graph against NearestNeighbors"""
+        rng = np.random.default_rng(2)
+        centers = rng.random((5, 50))
+        vectors = centers[rng.integers(0, 5, 80)] + rng.normal(0, 0.002, (80, 50))
+        vectors[1] = vectors[0]
+        normalized = ScoringEngine._standardize(vectors.astype(np.float32))
+        
+        expected = NearestNeighbors(radius=0.5).fit(normalized).radius_neighbors_graph(normalized, mode='distance')
+        graph = ScoringEngine._radius_graph_gemm(normalized, 0.5)
+        
+        def pairs(matrix):
+            coo = matrix.tocoo()
+            return set(zip(coo.row.tolist(), coo.col.tolist()))
+        
+        assert pairs(graph) == pairs(expected)
+        assert (0, 1) in pairs(graph)
+        # float32 expanded-form cancellation is ~1e-4 in squared distance,
+        # amplified by the square root only near zero
+        graph.sort_indices()
+        expected.sort_indices()
+        np.testing.assert_allclose(graph.data ** 2, expected.data ** 2, atol=2e-4)
+    
+    def test_deduplicated_dbscan_labels(self):
+        """Test that weighted unique rows give the same labels as all rows"""
+        rng = np.random.default_rng(3)
+        patterns = rng.random((6, 50))
+        vectors = patterns[rng.integers(0, 6, 120)]
+        vectors[::7] += rng.normal(0, 0.05, vectors[::7].shape)
+        
+        deduplicated = ScoringEngine({})._dbscan_labels(vectors.astype(np.float32))
+        expected = ScoringEngine({'dedupe_max_unique_ratio': 0.0})._dbscan_labels(vectors.astype(np.float32))
+        
+        assert len(np.unique(vectors, axis=0)) < 0.7 * len(vectors)
+        assert np.array_equal(deduplicated, expected)
+    
+    def test_grid_labels_above_max_dbscan_actors(self):
+        """Test that very large windows are grouped by grid hashing instead of DBSCAN"""
+        actors = self.create_actors()
+        engine = ScoringEngine({'max_dbscan_actors': 2})
+        engine._dbscan = Mock()
+        
+        campaigns = engine.cluster_campaigns(actors, {})
+        
+        assert not engine._dbscan.fit_predict.called
+        assert [sorted(a.ip_address for a in c.actors) for c in campaigns] == [
+            ['10.0.0.1', '10.0.0.3', '10.0.0.6'],
+            ['10.0.0.2', '10.0.0.5'],
+        ]
+        assert 'ISOLATED_ATTACKER' in actors[3].tags
+    
+    def test_grid_labels_weighted(self):
+        """Test grid cells, first-occurrence numbering and sample weights"""
+        vectors = np.array([[0.0, 0.0], [5.0, 5.0], [0.01, 0.0], [9.0, 9.0]], dtype=np.float32)
+        
+        assert ScoringEngine._grid_labels(vectors, 0.5).tolist() == [0, -1, 0, -1]
+        assert ScoringEngine._grid_labels(vectors, 0.5, np.array([1, 1, 1, 2])).tolist() == [0, -1, 0, 1]
+
+
+class TestPipelineScoringConfig:
+    """Test cases for the scoring worker settings taken from the global config"""
+
+    def test_global_worker_settings(self):
+        """Test that global.max_workers / enable_parallel reach ScoringEngine"""
+        from sigma_probe.main import HeliosPipeline
+
+        assert HeliosPipeline({'global': {'max_workers': 3}}).scoring_engine.n_jobs == 3
+        assert HeliosPipeline({'global': {'max_workers': 3, 'enable_parallel': False}}).scoring_engine.n_jobs == 1
+        assert HeliosPipeline({
+            'global': {'max_workers': 3},
+            'scoring_engine': {'n_jobs': 2},
+        }).scoring_engine.n_jobs == 2